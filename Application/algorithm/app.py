@@ -6,22 +6,32 @@ class AlgoPathPlanner:
     """
     Minimal application to generate a path and transmit commands based on obstacles in the grid.
     """
-    def __init__(self, obstacles):
+    def __init__(self, obstacles, grid=None):
         """
         Initializes the grid and robot based on the provided obstacles.
 
         Args:
             obstacles (list): List of obstacles to be used for grid and path planning.
+            grid (Grid, optional): Existing grid to reuse; it is updated in place to match the obstacles.
         """
         start_time = time.time()  # Start timer for initialization
-        self.grid = Grid(obstacles)  # Create grid with specified obstacles
+        if grid is None:
+            self.grid = Grid(obstacles)  # Create grid with specified obstacles
+        else:
+            grid.update_obstacles(obstacles)  # Only re-stamp obstacles that changed
+            self.grid = grid
         self.robot = Robot(self.grid)  # Initialize the robot within this grid
         print("Initialization time (grid and robot setup):", time.time() - start_time)
 
-    def execute(self):
+    def execute(self, deadline=None, epsilon=None):
         """
         Executes the path planning and returns the order of navigation steps.
 
+        Args:
+            deadline (float, optional): time.time() by which planning should finish; the best plan found
+                by then is returned. self.optimal records whether the best order was certainly scored.
+            epsilon (float, optional): Weighted A* bound for this plan, configs.PATH_SEARCH_EPSILON if None.
+
         Returns:
             list: Ordered path of waypoints or grid cells to navigate.
         """
@@ -29,7 +39,9 @@ class AlgoPathPlanner:
         start_time = time.time()  # Start timer for path calculation
 
         # Calculate path based on grid obstacles, returning order and target locations
-        order, targets = self.robot.brain.plan_path()
+        order, targets = self.robot.brain.plan_path(deadline, epsilon)
+        self.optimal = self.robot.brain.optimal
+        self.expansions = self.robot.brain.expansions
         print("Path calculation time:", time.time() - start_time)
 
         self.targets = targets  # Store calculated targets for further use if needed
@@ -42,9 +42,25 @@ OBSTACLE_TARGET_DISTANCE = 32 * SCALING_FACTOR  # Distance from obstacle for tar
 # Pathfinding Settings
 PATH_TURN_COST = 99999 * ROBOT_SPEED * (ROBOT_RIGHT_TURN_RADIUS_X + ROBOT_RIGHT_TURN_RADIUS_Y) / 2
 TURN_GRANULARITY = 3  # Precision of turn checking, values above 3 may reduce accuracy
+PATH_TURN_SCORE = 200  # Weight of a turn, in cm of straight travel, when comparing finished paths
+# How the obstacle visiting order is picked:
+#   'manhattan'    - A* over the NUM_HAM_PATH_CHECK orders closest by Manhattan distance
+#   'leg_costs'    - the same over the orders cheapest on the leg-cost matrix
+#   'held_karp'    - exact best order on the leg-cost matrix
+#   'gtsp'         - order and viewing pose chosen together
+#   'local_search' - near-best order on the leg-cost matrix, for large arenas
+PATH_ORDER_STRATEGY = 'manhattan'
+PATH_LOCAL_SEARCH_RESTARTS = 100  # Perturb-and-improve rounds of the 'local_search' strategy
+PATH_GTSP_MAX_TARGETS = 4  # Candidate viewing poses kept per obstacle by the 'gtsp' strategy
+PATH_GTSP_EXACT_LIMIT = 8  # Obstacle count up to which the 'gtsp' strategy is solved exactly
+PATH_COST_TO_GO_HEURISTIC = False  # Guide A* with reverse-search cost-to-go tables instead of Manhattan distance
+# Weighted A* bound: legs cost at most this factor more than the best the search can find, traded for fewer
+# expansions, with a heuristic that also counts the turns still needed. None keeps plain A*. Legs that cannot
+# be reached expand more than with plain A*, so pair it with PATH_COST_TO_GO_HEURISTIC, which rules them out.
+PATH_SEARCH_EPSILON = None
 
 # Threading Configuration for Processing
-NUM_THREADS = 1  # Number of threads for pathfinding computations
+NUM_THREADS = 1  # Worker processes for leg-cost rows and path evaluation; 1 keeps planning in-process
 NUM_HAM_PATH_CHECK = 5  # Number of hamiltonian paths to consider
 
 # Boundary Parameters for Path Detection
@@ -59,4 +75,13 @@ VERTICAL_MIN = 500  # Minimum allowable vertical threshold in mm
 VERTICAL_MAX = 700  # Maximum allowable vertical threshold in mm
 PEEK_ANGLE_THRESHOLD = 8  # Threshold angle in degrees for detecting peaks
 PIXEL_LEFT_THRESHOLD = 200  # Pixel threshold for left boundary detection
-PIXEL_RIGHT_THRESHOLD = 800  # Pixel threshold for right boundary detection
\ No newline at end of file
+PIXEL_RIGHT_THRESHOLD = 800  # Pixel threshold for right boundary detection
+
+# Camera Model for Viewpoint Generation
+CAMERA_FOCAL_LENGTH = 3.6  # Focal length in mm
+CAMERA_PIXEL_SIZE = 1.4  # Sensor pixel size in micrometres
+CAMERA_HEIGHT = 50  # Height of the image above the camera axis in mm
+
+# Algo Server Plan Cache
+PLAN_CACHE_SIZE = 32  # Number of obstacle layouts whose finished plans are kept, 0 disables caching
+PLAN_CACHE_MAX_AGE = None  # Seconds before a cached plan is evicted, None keeps it until it is least recently used
\ No newline at end of file
@@ -1,10 +1,12 @@
 import math
-from collections import deque
 from typing import List
 
+import numpy as np
+
 from algorithm import configs
-from algorithm.entities.grid.node import Node
+from algorithm.entities.grid.lattice import NodeLattice
 from algorithm.entities.grid.obstacle import Obstacle
+from algorithm.entities.grid.occupancy import OccupancyCache
 from algorithm.entities.grid.position import Position
 
 
@@ -17,64 +19,219 @@ class Grid:
         obstacles (List[Obstacle]): A list of Obstacle objects that define the grid's boundaries.
         """
         self.obstacles = obstacles  # Store obstacles within the grid.
-        self.cache = dict()  # Initialize a cache for quick position validity checks.
+        self.raster = None  # Boolean occupancy raster indexed as raster[x, y]; True marks a valid position.
+        self.cache = None  # Dict-like accessor over the raster for quick position validity checks.
+        self.lattice = None
+        self.shared = False  # True while the raster and lattice may be shared with a copy of this grid.
+        self.clearance_sq = None  # Squared distance to the nearest obstacle center, computed on first use.
         self.fill_cache()  # Populate the cache based on obstacle positions.
-        self.nodes = self.generate_nodes()  # Create nodes representing grid positions.
+        self.lattice = self.generate_nodes()  # Create the lattice of nodes representing grid positions.
 
     def fill_cache(self):
         """
         Fill the cache with valid and invalid positions based on obstacles and grid boundaries.
         Positions are marked as invalid if they are within the safety radius of any obstacle.
         """
+        self.detach()  # The lattice is refreshed in place below.
+        self.raster = np.ones((configs.GRID_LENGTH, configs.GRID_LENGTH), dtype=bool)
+        self.cache = OccupancyCache(self.raster)
+        self.refresh_region(0, configs.GRID_LENGTH, 0, configs.GRID_LENGTH)
+
+    def refresh_region(self, x_low, x_high, y_low, y_high):
+        """
+        Recompute the raster inside the half-open box [x_low, x_high) x [y_low, y_high) from the
+        current obstacle list, leaving every point outside the box untouched.
+        """
+        width, height = self.raster.shape
+        x_low, x_high = max(x_low, 0), min(x_high, width)
+        y_low, y_high = max(y_low, 0), min(y_high, height)
+        if x_low >= x_high or y_low >= y_high:
+            return
+        self.detach()
+
         # Initially assume all positions are valid.
-        for x in range(800):
-            for y in range(800):
-                self.cache[(x, y)] = True
+        region = self.raster[x_low:x_high, y_low:y_high]
+        region[:] = True
 
         # Mark positions around obstacles as invalid based on the safety radius.
         for obstacle in self.obstacles:
-            obstacle_x = obstacle.pos.x
-            obstacle_y = obstacle.pos.y
-            safety_radius = configs.OBSTACLE_SAFETY_WIDTH
+            self.stamp_disc(obstacle.pos.x, obstacle.pos.y, configs.OBSTACLE_SAFETY_WIDTH,
+                            (x_low, x_high, y_low, y_high))
+
+        self.apply_border(region, np.arange(x_low, x_high)[:, None], np.arange(y_low, y_high)[None, :])
 
-            # Iterate through the grid points and invalidate those within the safety radius.
-            for x in range(800):
-                for y in range(800):
-                    distance = math.sqrt((x - obstacle_x) ** 2 + (y - obstacle_y) ** 2)
-                    if distance < safety_radius:
-                        self.cache[(x, y)] = False
+        self.clearance_sq = None  # The obstacle layout changed.
+        self.refresh_nodes(x_low, x_high, y_low, y_high)
 
+    def apply_border(self, region, xs, ys):
+        """
+        Apply the arena border rules in place to a boolean validity region.
+
+        Parameters:
+        region (numpy.ndarray): Validity values for the points spanned by xs and ys.
+        xs (numpy.ndarray): x-coordinates of the region as a column vector.
+        ys (numpy.ndarray): y-coordinates of the region as a row vector.
+        """
         # Check positions near the grid border to ensure they are valid.
-        for x in range(800):
-            for y in range(800):
-                # Adjust border validity to allow slight overextension for robots.
-                if (y < configs.GRID_CELL_LENGTH or y > configs.GRID_LENGTH - configs.GRID_CELL_LENGTH) or \
-                   (x < configs.GRID_CELL_LENGTH or x > configs.GRID_LENGTH - configs.GRID_CELL_LENGTH):
-                    self.cache[(x, y)] = False
+        # Adjust border validity to allow slight overextension for robots.
+        inner_low = configs.GRID_CELL_LENGTH
+        inner_high = configs.GRID_LENGTH - configs.GRID_CELL_LENGTH
+        region &= ~((ys < inner_low) | (ys > inner_high) | (xs < inner_low) | (xs > inner_high))
+
+        # Explicitly mark edge positions as valid.
+        region |= (xs < 30) | (xs > 770) | (ys < 30) | (ys > 770)
 
-                # Explicitly mark edge positions as valid.
-                if x < 30 or x > 770 or y < 30 or y > 770:
-                    self.cache[(x, y)] = True
+    def get_clearance_sq(self):
+        """
+        Returns the clearance field: for every raster point, the squared distance to the nearest
+        obstacle center. It is computed once per obstacle layout and reused for any safety width.
+        """
+        if self.clearance_sq is None:
+            width, height = self.raster.shape
+            xs = np.arange(width, dtype=np.int32)[:, None]
+            ys = np.arange(height, dtype=np.int32)[None, :]
+            clearance_sq = np.full((width, height), np.iinfo(np.int32).max, dtype=np.int32)
+            for obstacle in self.obstacles:
+                np.minimum(clearance_sq, (xs - int(obstacle.pos.x)) ** 2 + (ys - int(obstacle.pos.y)) ** 2,
+                           out=clearance_sq)
+            self.clearance_sq = clearance_sq
+        return self.clearance_sq
+
+    def get_clearance(self, x, y):
+        """
+        Returns the distance from (x, y) to the nearest obstacle center, or None outside the grid.
+        """
+        x, y = int(x), int(y)
+        width, height = self.raster.shape
+        if not (0 <= x < width and 0 <= y < height):
+            return None
+        return math.sqrt(self.get_clearance_sq()[x, y])
+
+    def valid_mask(self, safety_width=None):
+        """
+        Returns the validity raster for a given obstacle safety width, derived from the clearance field.
+        With the default width this equals the grid's own raster.
+
+        Parameters:
+        safety_width (int, optional): Exclusion radius around obstacle centers, OBSTACLE_SAFETY_WIDTH by default.
+        """
+        if safety_width is None:
+            safety_width = configs.OBSTACLE_SAFETY_WIDTH
+        width, height = self.raster.shape
+        mask = self.get_clearance_sq() >= int(safety_width) ** 2
+        self.apply_border(mask, np.arange(width)[:, None], np.arange(height)[None, :])
+        return mask
+
+    def refresh_nodes(self, x_low, x_high, y_low, y_high):
+        """
+        Re-derive the occupied flag of every cell whose center lies inside the given box.
+        """
+        if self.lattice is None:
+            return  # The lattice is generated after the initial fill.
+
+        half_cell = configs.GRID_CELL_LENGTH // 2
+        col_low = max(math.ceil((x_low - half_cell) / configs.GRID_CELL_LENGTH), 0)
+        col_high = min(math.ceil((x_high - half_cell) / configs.GRID_CELL_LENGTH), configs.GRID_NUM_GRIDS)
+        row_low = max(math.ceil((y_low - half_cell) / configs.GRID_CELL_LENGTH), 0)
+        row_high = min(math.ceil((y_high - half_cell) / configs.GRID_CELL_LENGTH), configs.GRID_NUM_GRIDS)
+
+        for row in range(row_low, row_high):
+            for col in range(col_low, col_high):
+                index = row * configs.GRID_NUM_GRIDS + col
+                self.lattice.set_occupied(index, not self.check_valid_position(Position(*self.lattice.center(index))))
+
+    def stamp_disc(self, center_x, center_y, radius, bounds=None):
+        """
+        Invalidate every raster point strictly closer than ``radius`` to the given center.
+
+        Parameters:
+        center_x (int): The x-coordinate of the disc center.
+        center_y (int): The y-coordinate of the disc center.
+        radius (int): The exclusion radius around the center.
+        bounds (tuple, optional): Half-open (x_low, x_high, y_low, y_high) box to clip the stamp to.
+        """
+        x_low, x_high, y_low, y_high = self.disc_bounds(center_x, center_y, radius)
+        if bounds is not None:
+            x_low, x_high = max(x_low, bounds[0]), min(x_high, bounds[1])
+            y_low, y_high = max(y_low, bounds[2]), min(y_high, bounds[3])
+        if x_low >= x_high or y_low >= y_high:
+            return
+        self.detach()
+
+        dx = np.arange(x_low, x_high) - int(center_x)
+        dy = np.arange(y_low, y_high) - int(center_y)
+        inside = dx[:, None] ** 2 + dy[None, :] ** 2 < int(radius) ** 2
+        self.raster[x_low:x_high, y_low:y_high] &= ~inside
+
+    def disc_bounds(self, center_x, center_y, radius):
+        """
+        Returns the half-open raster box (x_low, x_high, y_low, y_high) covering a disc.
+        """
+        width, height = self.raster.shape
+        center_x, center_y, radius = int(center_x), int(center_y), int(radius)
+        return (max(center_x - radius + 1, 0), min(center_x + radius, width),
+                max(center_y - radius + 1, 0), min(center_y + radius, height))
+
+    def obstacle_bounds(self, obstacle: Obstacle):
+        """
+        Returns the raster box affected by an obstacle's safety disc.
+        """
+        return self.disc_bounds(obstacle.pos.x, obstacle.pos.y, configs.OBSTACLE_SAFETY_WIDTH)
+
+    def add_obstacle(self, obstacle: Obstacle):
+        """
+        Add an obstacle and re-stamp only the area covered by its safety disc.
+        """
+        self.obstacles.append(obstacle)
+        self.refresh_region(*self.obstacle_bounds(obstacle))
+
+    def remove_obstacle(self, obstacle: Obstacle):
+        """
+        Remove an obstacle and restore the area it covered, keeping any overlapping obstacles.
+        """
+        self.obstacles.remove(obstacle)
+        self.refresh_region(*self.obstacle_bounds(obstacle))
+
+    def move_obstacle(self, obstacle: Obstacle, new_obstacle: Obstacle):
+        """
+        Replace an obstacle with its moved version, re-stamping both the old and the new area.
+        """
+        self.obstacles[self.obstacles.index(obstacle)] = new_obstacle
+        self.refresh_region(*self.obstacle_bounds(obstacle))
+        self.refresh_region(*self.obstacle_bounds(new_obstacle))
+
+    def update_obstacles(self, obstacles: List[Obstacle]):
+        """
+        Bring the grid in line with a freshly received obstacle list. Obstacles are matched by index
+        and only those that were added, removed or moved trigger a re-stamp.
+        """
+        old = {obstacle.index: obstacle for obstacle in self.obstacles}
+        new = {obstacle.index: obstacle for obstacle in obstacles}
+
+        changed = []
+        for index, obstacle in old.items():
+            if index not in new or new[index].pos.xy_coords() != obstacle.pos.xy_coords():
+                changed.append(obstacle)
+        for index, obstacle in new.items():
+            if index not in old or old[index].pos.xy_coords() != obstacle.pos.xy_coords():
+                changed.append(obstacle)
+
+        self.obstacles = obstacles
+        for obstacle in changed:
+            self.refresh_region(*self.obstacle_bounds(obstacle))
 
     def generate_nodes(self):
         """
-        Create a grid of Node objects based on the specified grid size and cell dimensions.
-        
+        Create the lattice of grid cells based on the specified grid size and cell dimensions.
+
         Returns:
-        deque: A deque of rows, each containing Node objects representing the grid.
-        """
-        nodes = deque()  # Initialize a deque to hold rows of nodes.
-        for i in range(configs.GRID_NUM_GRIDS):
-            row = deque()  # Create a new row for nodes.
-            for j in range(configs.GRID_NUM_GRIDS):
-                # Calculate the center coordinates for the node in the grid.
-                x = (configs.GRID_CELL_LENGTH // 2) + (configs.GRID_CELL_LENGTH * j)
-                y = (configs.GRID_CELL_LENGTH // 2) + (configs.GRID_CELL_LENGTH * i)
-                # Create a new Node, marking it occupied based on its validity.
-                new_node = Node(x, y, not self.check_valid_position(Position(x, y)))
-                row.append(new_node)  # Add the new node to the row.
-            nodes.appendleft(row)  # Add the row of nodes to the grid.
-        return nodes  # Return the complete grid of nodes.
+        NodeLattice: Flat lattice whose cells are marked occupied based on the validity of their centers.
+        """
+        # Calculate the center coordinates of every column / row in the grid.
+        centers = (configs.GRID_CELL_LENGTH // 2) + configs.GRID_CELL_LENGTH * np.arange(configs.GRID_NUM_GRIDS)
+        # raster is indexed [x, y]; transpose so the flat index runs row (y) major.
+        occupied = ~self.raster[np.ix_(centers, centers)].T
+        return NodeLattice(occupied.flatten())
 
     def get_coordinate_node(self, x, y):
         """
@@ -87,38 +244,68 @@ class Grid:
         Returns:
         Node or None: The corresponding Node object, or None if out of bounds.
         """
-        col_num = math.floor(x / configs.GRID_CELL_LENGTH)
-        row_num = configs.GRID_NUM_GRIDS - math.floor(y / configs.GRID_CELL_LENGTH) - 1
-        try:
-            return self.nodes[row_num][col_num]  # Return the corresponding node.
-        except IndexError:
+        index = self.lattice.index(x, y)
+        if index == -1:
             return None  # Return None if the coordinates are out of bounds.
+        return self.lattice.node(index)  # Return the corresponding node.
 
     def copy(self):
         """
         Create and return a copy of the current grid with the same obstacle configuration.
+        The raster and lattice are shared with this grid rather than rebuilt; whichever grid is
+        mutated first takes a private copy of them (see detach).
         
         Returns:
         Grid: A new Grid instance that is a copy of the current one.
         """
-        nodes = []  # List to hold the copied node rows.
-        for row in self.nodes:
-            new_row = [col.copy() for col in row]  # Copy each node in the row.
-            nodes.append(new_row)  # Add the copied row to the list.
-        new_grid = Grid(self.obstacles)  # Create a new Grid with the same obstacles.
-        new_grid.nodes = nodes  # Assign the copied nodes to the new grid.
+        new_grid = Grid.__new__(Grid)  # Skip __init__, nothing needs to be recomputed.
+        new_grid.obstacles = list(self.obstacles)
+        new_grid.raster = self.raster
+        new_grid.cache = self.cache
+        new_grid.lattice = self.lattice
+        new_grid.clearance_sq = self.clearance_sq  # Never updated in place, only replaced.
+        new_grid.shared = self.shared = True
         return new_grid  # Return the copied grid.
 
-    def check_valid_position(self, pos: Position):
+    def detach(self):
+        """
+        Give this grid private copies of the raster and lattice if they may be shared with another grid.
+        Called before any in-place update.
+        """
+        if not self.shared:
+            return
+        self.raster = self.raster.copy()
+        self.cache = OccupancyCache(self.raster)
+        if self.lattice is not None:
+            self.lattice = NodeLattice(self.lattice.occupied.copy())
+        self.shared = False
+
+    def check_valid_position(self, pos: Position, safety_width=None):
         """
         Determine if a given position is valid within the grid.
         
         Parameters:
         pos (Position): The Position object representing the coordinates to check.
+        safety_width (int, optional): Obstacle safety width to check against instead of the one the
+            grid was built with; answered from the clearance field without rebuilding the grid.
 
         Returns:
         bool: True if the position is valid; False otherwise.
         """
+        if safety_width is not None:
+            x, y = int(pos.x), int(pos.y)
+            width, height = self.raster.shape
+            if not (0 <= x < width and 0 <= y < height):
+                return False
+            # The border rules of apply_border, applied to a single point.
+            if x < 30 or x > 770 or y < 30 or y > 770:
+                return True
+            inner_low = configs.GRID_CELL_LENGTH
+            inner_high = configs.GRID_LENGTH - configs.GRID_CELL_LENGTH
+            if not (inner_low <= x <= inner_high and inner_low <= y <= inner_high):
+                return False
+            return bool(self.get_clearance_sq()[x, y] >= int(safety_width) ** 2)
+
         # Check the cache for the validity of the specified position.
         if self.cache.get((int(pos.x), int(pos.y))) is not None:
             return self.cache[(int(pos.x), int(pos.y))]
@@ -158,6 +345,66 @@ class Grid:
         
         return not obstructed  # Return True if not obstructed, False otherwise.
 
+    def check_valid_sights(self, views, target_obstacle):
+        """
+        Batched version of check_valid_sight for many viewing positions of the same target obstacle.
+
+        Parameters:
+        views: Array-like of shape (n, 2) holding the (x, y) grid coordinates of each viewing position.
+        target_obstacle: The obstacle being targeted.
+
+        Returns:
+        numpy.ndarray: Boolean mask, True where the target can be seen from the corresponding view.
+        """
+        views = np.asarray(views).reshape(-1, 2)
+        occluders = [ob for ob in self.obstacles if ob != target_obstacle]
+        if len(views) == 0 or not occluders:
+            return np.ones(len(views), dtype=bool)
+
+        # Views run along the first axis and occluding obstacles along the second.
+        view_x = views[:, 0:1]
+        view_y = views[:, 1:2]
+        obstacle_x = np.array([[ob.pos.x for ob in occluders]])
+        obstacle_y = np.array([[ob.pos.y for ob in occluders]])
+
+        # A view inside another obstacle's safety boundary is obstructed.
+        within_boundary = ((obstacle_x - configs.OBSTACLE_SAFETY_WIDTH < view_x) &
+                           (view_x < obstacle_x + configs.OBSTACLE_SAFETY_WIDTH) &
+                           (obstacle_y - configs.OBSTACLE_SAFETY_WIDTH < view_y) &
+                           (view_y < obstacle_y + configs.OBSTACLE_SAFETY_WIDTH))
+
+        # So is a view whose line of sight to the target passes too close to another obstacle.
+        distance = self.distances_to_segments(view_x // configs.SCALING_FACTOR, view_y // configs.SCALING_FACTOR,
+                                              target_obstacle.x_cm, target_obstacle.y_cm,
+                                              np.array([[ob.x_cm for ob in occluders]]),
+                                              np.array([[ob.y_cm for ob in occluders]]))
+
+        return ~(within_boundary | (distance < 15)).any(axis=1)
+
+    def distances_to_segments(self, x_view, y_view, x_target, y_target, x_obstacle, y_obstacle):
+        """
+        Vectorized distance_to_segment; the arguments broadcast against each other like NumPy arrays.
+
+        Returns:
+        numpy.ndarray: The distance from each obstacle point to each view-target segment.
+        """
+        segment_dx = x_target - x_view
+        segment_dy = y_target - y_view
+        segment_length = np.sqrt(segment_dx ** 2 + segment_dy ** 2)
+
+        dx = x_obstacle - x_view
+        dy = y_obstacle - y_view
+
+        # Projection of the obstacle onto the segment, clamped the same way as distance_to_segment.
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.maximum(0, np.minimum(segment_length, (dx * segment_dx + dy * segment_dy) / (segment_length ** 2)))
+        nearest_point_x = x_view + t * segment_dx
+        nearest_point_y = y_view + t * segment_dy
+        distance = np.sqrt((x_obstacle - nearest_point_x) ** 2 + (y_obstacle - nearest_point_y) ** 2)
+
+        # A zero-length segment degenerates to the distance to the view point.
+        return np.where(segment_length == 0, np.sqrt(dx ** 2 + dy ** 2), distance)
+
     def distance_to_segment(self, x_view, y_view, x_target, y_target, x_obstacle, y_obstacle):
         """
         Calculate the distance from a point (x_obstacle, y_obstacle) to the line segment 
@@ -0,0 +1,85 @@
+import math
+
+from algorithm import configs
+from algorithm.entities.assets.direction import Direction
+from algorithm.entities.grid.node import Node
+
+# Headings in counter-clockwise order; a search state is encoded as cell index * 4 + heading index.
+HEADINGS = (Direction.RIGHT, Direction.TOP, Direction.LEFT, Direction.BOTTOM)
+HEADING_INDEX = {direction: i for i, direction in enumerate(HEADINGS)}
+
+
+class NodeLattice:
+    def __init__(self, occupied):
+        """
+        Flat, array-backed lattice of grid cells.
+
+        Cell ``i`` covers column ``i % GRID_NUM_GRIDS`` and row ``i // GRID_NUM_GRIDS``, with rows counted
+        from the bottom of the arena. Node objects are only materialized when a cell is looked up.
+
+        Parameters:
+        occupied (numpy.ndarray): Flat boolean array, True where the cell center is not a valid position.
+        """
+        self.size = configs.GRID_NUM_GRIDS  # Number of cells along each side.
+        self.occupied = occupied
+        self.nodes = [None] * len(occupied)  # Materialized nodes, filled on demand.
+
+    def __len__(self):
+        return len(self.occupied)
+
+    @property
+    def num_states(self):
+        """
+        Returns the number of (cell, heading) search states on the lattice.
+        """
+        return len(self.occupied) * len(HEADINGS)
+
+    def index(self, x, y):
+        """
+        Returns the integer index of the cell containing (x, y), or -1 if it lies outside the grid.
+        """
+        col = math.floor(x / configs.GRID_CELL_LENGTH)
+        row = math.floor(y / configs.GRID_CELL_LENGTH)
+        if 0 <= col < self.size and 0 <= row < self.size:
+            return row * self.size + col
+        return -1
+
+    def center(self, index):
+        """
+        Returns the (x, y) coordinates of the center of a cell.
+        """
+        row, col = divmod(index, self.size)
+        return ((configs.GRID_CELL_LENGTH // 2) + (configs.GRID_CELL_LENGTH * col),
+                (configs.GRID_CELL_LENGTH // 2) + (configs.GRID_CELL_LENGTH * row))
+
+    def node(self, index):
+        """
+        Returns the Node of a cell, creating it on first access.
+        """
+        node = self.nodes[index]
+        if node is None:
+            node = Node(*self.center(index), bool(self.occupied[index]))
+            self.nodes[index] = node
+        return node
+
+    def state_key(self, index, direction):
+        """
+        Encodes a cell index and heading as a single integer search state.
+        """
+        return index * len(HEADINGS) + HEADING_INDEX[direction]
+
+    def split_state(self, state):
+        """
+        Decodes a search state back into its (cell index, heading) pair.
+        """
+        index, heading = divmod(state, len(HEADINGS))
+        return index, HEADINGS[heading]
+
+    def set_occupied(self, index, occupied):
+        """
+        Updates the occupancy of a cell and of its Node if one has been materialized.
+        """
+        self.occupied[index] = occupied
+        node = self.nodes[index]
+        if node is not None:
+            node.occupied = occupied
@@ -1,6 +1,9 @@
 from algorithm.entities.grid.position import Position
 
 class Node:
+    # Nodes are used as dictionary keys, so their coordinates and direction must not change after creation.
+    __slots__ = ('pos', 'occupied', 'x', 'y', 'direction', '_hash')
+
     def __init__(self, x, y, occupied, direction=None):
         """
         Initializes a grid node with specified coordinates and occupancy status.
@@ -16,6 +19,7 @@ class Node:
         self.x = x 
         self.y = y 
         self.direction = direction 
+        self._hash = hash((x, y, direction))  # Computed once instead of on every dictionary probe.
 
     def __str__(self):
         return f"Node({self.pos})"  # String representation of the node.
@@ -28,19 +32,20 @@ class Node:
         
         Two nodes are considered equal if their positions and directions match.
         """
-        return self.pos.xy_direction() == other.pos.xy_direction()  # Compare based on position and direction.
+        return self.x == other.x and self.y == other.y and self.direction == other.direction
 
     def __hash__(self):
         """
-        Generates a hash value for the node based on its position and direction.
+        Returns the hash value for the node based on its position and direction.
         This is useful for using nodes in sets or as dictionary keys.
         """
-        return hash(self.pos.xy_direction())  # Use the position's XY coordinates for hashing.
+        return self._hash
 
-    def copy(self):
+    def copy(self, direction=None):
         """
         Creates and returns a duplicate of this node.
         
-        The new node will have the same coordinates and occupancy status as the original.
+        The new node will have the same coordinates and occupancy status as the original, and
+        the given direction if one is supplied.
         """
-        return Node(self.pos.x, self.pos.y, self.occupied, self.pos.direction)  # Create a new node with identical properties.
+        return Node(self.x, self.y, self.occupied, direction if direction is not None else self.direction)
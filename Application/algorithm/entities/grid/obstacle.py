@@ -2,6 +2,7 @@ import math
 from algorithm import configs
 from algorithm.entities.assets.direction import Direction
 from algorithm.entities.grid.position import Position, RobotPosition
+from algorithm.entities.grid.viewpoint import get_view_template
 
 class Obstacle:
     def __init__(self, x, y, direction, index):
@@ -62,59 +63,25 @@ class Obstacle:
     def get_all_possible_centers(self):
         """
         Calculates all possible centers based on sensor parameters and obstacle properties.
+        The precomputed viewpoint template for the obstacle's direction is translated onto the
+        obstacle and clipped to the grid.
         """
-        height = 50
-        possible_centers = []
+        cen_dis = configs.GRID_CELL_LENGTH // 2
+        dx, dy = get_view_template(self.direction,
+                                   (cen_dis - self.pos.x) % configs.GRID_CELL_LENGTH,
+                                   (cen_dis - self.pos.y) % configs.GRID_CELL_LENGTH)
 
-        for i in range(configs.GRID_NUM_GRIDS):
-            for j in range(configs.GRID_NUM_GRIDS):
-                x = i * configs.GRID_CELL_LENGTH
-                y = j * configs.GRID_CELL_LENGTH
-                cen_dis = configs.GRID_CELL_LENGTH // 2
-                x_mm = (x + cen_dis) * 10 / configs.SCALING_FACTOR
-                y_mm = (y + cen_dis) * 10 / configs.SCALING_FACTOR
-                
-                x_view = x_mm - self.x_cm * 10
-                y_view = y_mm - self.y_cm * 10
-                
-                if ((self.direction == Direction.LEFT and x_view > 0) or
-                    (self.direction == Direction.RIGHT and x_view < 0) or
-                    (self.direction == Direction.TOP and y_view < 0) or
-                    (self.direction == Direction.BOTTOM and y_view > 0)):
-                    continue
-                
-                x_view = abs(x_view)
-                y_view = abs(y_view)
-                
-                if (self.direction in {Direction.TOP, Direction.BOTTOM}):
-                    if (y_view < (configs.OBSTACLE_SAFETY_WIDTH + configs.OBSTACLE_LENGTH) * 10 / configs.SCALING_FACTOR + 100):
-                        continue
-                    if y_view < configs.VERTICAL_MIN:
-                        continue
-                    u, v = self.get_uv(x_view, height, y_view)
-                else:
-                    if (x_view < (configs.OBSTACLE_SAFETY_WIDTH + configs.OBSTACLE_LENGTH) * 10 / configs.SCALING_FACTOR + 100):
-                        continue
-                    if x_view < configs.VERTICAL_MIN:
-                        continue
-                    u, v = self.get_uv(y_view, height, x_view)
-
-                if (configs.PIXEL_LEFT_THRESHOLD < u < configs.PIXEL_RIGHT_THRESHOLD and 0 < v < 1024):
-                    if (x_view > configs.VERTICAL_MAX or y_view > configs.VERTICAL_MAX):
-                        continue
-                    
-                    x_grid = i * configs.GRID_CELL_LENGTH + configs.GRID_CELL_LENGTH // 2
-                    y_grid = j * configs.GRID_CELL_LENGTH + configs.GRID_CELL_LENGTH // 2
-                    possible_centers.append((x_grid, y_grid))
-
-        return possible_centers
+        x_grid = self.pos.x + dx
+        y_grid = self.pos.y + dy
+        inside = (x_grid >= 0) & (x_grid < configs.GRID_LENGTH) & (y_grid >= 0) & (y_grid < configs.GRID_LENGTH)
+        return list(zip(x_grid[inside].tolist(), y_grid[inside].tolist()))
 
     def get_uv(self, horizontal, height, vertical):
         """
         Computes the image pixel coordinates from 3D world coordinates.
         """
-        f = 3.6  # mm
-        pixel_size = 1.4
+        f = configs.CAMERA_FOCAL_LENGTH  # mm
+        pixel_size = configs.CAMERA_PIXEL_SIZE
         e = 0.001
         x, y, z = horizontal, height, vertical
         
@@ -0,0 +1,35 @@
+class OccupancyCache:
+    def __init__(self, raster):
+        """
+        Wraps a boolean occupancy raster so it can be queried like the old ``(x, y) -> bool`` dict.
+
+        Parameters:
+        raster (numpy.ndarray): Boolean array indexed as ``raster[x, y]``; True marks a valid position.
+        """
+        self.raster = raster
+        self.width, self.height = raster.shape
+
+    def __contains__(self, key):
+        x, y = key
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def __getitem__(self, key):
+        """
+        Returns the validity of the point, raising KeyError if it lies outside the raster.
+        """
+        x, y = key
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return bool(self.raster[x, y])
+        raise KeyError(key)
+
+    def __len__(self):
+        return self.width * self.height
+
+    def get(self, key, default=None):
+        """
+        Returns the validity of the point, or ``default`` if it lies outside the raster.
+        """
+        x, y = key
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return bool(self.raster[x, y])
+        return default
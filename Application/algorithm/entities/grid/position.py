@@ -3,6 +3,8 @@ from algorithm.entities.assets.direction import Direction
 
 
 class Position:
+    __slots__ = ('x', 'y', 'direction')
+
     def __init__(self, x, y, direction: Direction = None):
         """
         Initializes Position with x, y coordinates and an optional direction.
@@ -74,6 +76,8 @@ class Position:
 
 
 class RobotPosition(Position):
+    __slots__ = ('angle',)
+
     def __init__(self, x, y, direction: Direction = None, angle=None):
         """
         Initializes RobotPosition with x, y coordinates, direction, and an optional angle.
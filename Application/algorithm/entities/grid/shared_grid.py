@@ -0,0 +1,85 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from algorithm.entities.grid.lattice import NodeLattice
+from algorithm.entities.grid.occupancy import OccupancyCache
+
+
+class SharedGrid:
+    def __init__(self, grid):
+        """
+        Copies the occupancy raster and lattice occupancy of a grid into one shared memory block, laid out as
+        the raster followed by the flat lattice array. Use as a context manager, or call close() when the
+        workers are done, to release the block.
+
+        Parameters:
+        grid (Grid): Grid to export. Later changes to it are not reflected in the block.
+        """
+        raster, occupied = grid.raster, grid.lattice.occupied
+        self.memory = shared_memory.SharedMemory(create=True, size=raster.nbytes + occupied.nbytes)
+        self.view = SharedGridView(self.memory.name, raster.shape, len(occupied), grid.obstacles, self.memory)
+        self.view.raster[:] = raster
+        self.view.lattice.occupied[:] = occupied
+        self.view.lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Detaches the exported view and frees the shared memory block.
+        """
+        self.view.close()
+        self.memory.unlink()
+
+
+class SharedGridView:
+    def __init__(self, name, shape, num_cells, obstacles, memory=None):
+        """
+        Read-only grid over a shared memory block exported by SharedGrid. It offers the raster, cache,
+        lattice and obstacles that ModifiedAStar and the leg-cost searches read, so it can be used in place
+        of a Grid for searching. When pickled to another process only the block name, the shapes and the
+        obstacles are sent, and the receiving process attaches to the same memory without copying it.
+
+        Parameters:
+        name (str): Name of the shared memory block.
+        shape (tuple): (width, height) of the occupancy raster.
+        num_cells (int): Number of cells of the lattice.
+        obstacles (list): Obstacles of the exported grid.
+        memory (SharedMemory, optional): Block already opened by the caller, attached by name otherwise.
+        """
+        self.name = name
+        self.shape = tuple(shape)
+        self.num_cells = num_cells
+        self.obstacles = obstacles
+        self.memory = memory if memory is not None else shared_memory.SharedMemory(name=name)
+
+        raster_size = self.shape[0] * self.shape[1]
+        self.raster = np.ndarray(self.shape, dtype=bool, buffer=self.memory.buf)
+        self.cache = OccupancyCache(self.raster)
+        self.lattice = NodeLattice(np.ndarray((num_cells,), dtype=bool, buffer=self.memory.buf, offset=raster_size))
+
+    def __getstate__(self):
+        return self.name, self.shape, self.num_cells, self.obstacles
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+        self.lock()
+
+    def lock(self):
+        """
+        Marks the arrays read-only, so an accidental write raises instead of changing every worker's grid.
+        """
+        self.raster.flags.writeable = False
+        self.lattice.occupied.flags.writeable = False
+
+    def close(self):
+        """
+        Drops the arrays and detaches from the shared memory block.
+        """
+        self.raster = self.cache = self.lattice = None
+        self.memory.close()
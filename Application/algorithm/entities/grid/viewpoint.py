@@ -0,0 +1,98 @@
+import numpy as np
+
+from algorithm import configs
+from algorithm.entities.assets.direction import Direction
+
+# Every config value that decides which cells can see an obstacle; templates are rebuilt when any changes.
+TEMPLATE_CONFIGS = (
+    'SCALING_FACTOR', 'GRID_LENGTH', 'GRID_CELL_LENGTH', 'OBSTACLE_LENGTH', 'OBSTACLE_SAFETY_WIDTH',
+    'VERTICAL_MIN', 'VERTICAL_MAX', 'PIXEL_LEFT_THRESHOLD', 'PIXEL_RIGHT_THRESHOLD',
+    'CAMERA_FOCAL_LENGTH', 'CAMERA_PIXEL_SIZE', 'CAMERA_HEIGHT',
+)
+
+_templates = {}  # (direction, phase_x, phase_y) -> (dx, dy) offset arrays
+_templates_signature = None  # Config values the stored templates were built with
+
+
+def get_uv_array(horizontal, height, vertical):
+    """
+    Computes image pixel coordinates for arrays of horizontal and (non-zero) vertical distances in mm.
+    """
+    f = configs.CAMERA_FOCAL_LENGTH  # mm
+    pixel_size = configs.CAMERA_PIXEL_SIZE
+    e = 0.001
+    x, y, z = horizontal, height, vertical
+
+    theta = np.arccos(np.abs(z) / np.sqrt(x ** 2 + z ** 2))
+    u = f * (x / z - y * np.tan(theta) / z) / (pixel_size * e)
+
+    v = f * (y / (z * np.cos(theta))) / (pixel_size * e)  # height pixel
+    v = 512 - v * (1024 / 1944)  # flip up
+    u = 512 + u * (1024 / 2592)
+
+    return u, v
+
+
+def build_view_template(direction: Direction, phase_x, phase_y):
+    """
+    Finds every cell-center offset (relative to the obstacle, in grid units) from which an image facing
+    ``direction`` is in frame. ``phase_x``/``phase_y`` give the offset from the obstacle to the cell centers
+    in each axis, between 0 and GRID_CELL_LENGTH. Obstacle centers lie 5 cm off the 10 cm grid, which is
+    always a cell corner, so both are GRID_CELL_LENGTH // 2 for every real obstacle.
+
+    Returns:
+    tuple: Arrays (dx, dy) ordered by dx then dy, matching a scan over x then y.
+    """
+    # Offsets wide enough to reach every cell from an obstacle anywhere in the arena.
+    steps = np.arange(-configs.GRID_NUM_GRIDS, configs.GRID_NUM_GRIDS + 1) * configs.GRID_CELL_LENGTH
+    dx, dy = np.meshgrid(steps + phase_x, steps + phase_y, indexing='ij')
+    dx, dy = dx.ravel(), dy.ravel()
+
+    x_view = dx * 10 / configs.SCALING_FACTOR  # mm
+    y_view = dy * 10 / configs.SCALING_FACTOR  # mm
+
+    # Only cells on the side the image is facing can see it.
+    if direction == Direction.LEFT:
+        keep = x_view <= 0
+    elif direction == Direction.RIGHT:
+        keep = x_view >= 0
+    elif direction == Direction.TOP:
+        keep = y_view >= 0
+    else:
+        keep = y_view <= 0
+
+    x_view = np.abs(x_view)
+    y_view = np.abs(y_view)
+
+    if direction in {Direction.TOP, Direction.BOTTOM}:
+        horizontal, vertical = x_view, y_view
+    else:
+        horizontal, vertical = y_view, x_view
+    keep &= vertical >= (configs.OBSTACLE_SAFETY_WIDTH + configs.OBSTACLE_LENGTH) * 10 / configs.SCALING_FACTOR + 100
+    keep &= vertical >= configs.VERTICAL_MIN
+    keep &= (x_view <= configs.VERTICAL_MAX) & (y_view <= configs.VERTICAL_MAX)
+
+    # Project only the remaining offsets; vertical is at least VERTICAL_MIN so it is never zero here.
+    u, v = get_uv_array(horizontal[keep], configs.CAMERA_HEIGHT, vertical[keep])
+    in_frame = (configs.PIXEL_LEFT_THRESHOLD < u) & (u < configs.PIXEL_RIGHT_THRESHOLD) & (0 < v) & (v < 1024)
+
+    return dx[keep][in_frame], dy[keep][in_frame]
+
+
+def get_view_template(direction: Direction, phase_x, phase_y):
+    """
+    Returns the cached viewpoint template for an image direction and cell-center phase, rebuilding all
+    templates if any of the camera, threshold or grid configs changed since they were computed.
+    """
+    global _templates_signature
+    signature = tuple(getattr(configs, name) for name in TEMPLATE_CONFIGS)
+    if signature != _templates_signature:
+        _templates.clear()
+        _templates_signature = signature
+
+    key = (direction, phase_x, phase_y)
+    template = _templates.get(key)
+    if template is None:
+        template = build_view_template(direction, phase_x, phase_y)
+        _templates[key] = template
+    return template
@@ -1,5 +1,7 @@
+import copy
 import itertools
 import math
+import time
 
 from collections import deque
 from algorithm import configs
@@ -7,7 +9,34 @@ from algorithm.entities.assets.direction import Direction
 from algorithm.entities.commands.scan_command import ScanCommand
 from algorithm.entities.commands.straight_command import StraightCommand
 from algorithm.entities.commands.turn_command import TurnCommand
-from algorithm.entities.robot.brain.mod_a_star import ModifiedAStar
+from algorithm.entities.robot.brain.cost_to_go import CostToGoTables
+from algorithm.entities.robot.brain.leg_costs import (compute_leg_costs, compute_pose_costs, score_order,
+                                                      search_leg_costs)
+from algorithm.entities.robot.brain.mod_a_star import ModifiedAStar, SearchBuffers
+from algorithm.entities.robot.brain.order_solvers import (candidate_orders, held_karp, layered_costs_to_go,
+                                                          local_search, or_opt_moves, solve_gtsp, two_opt_moves)
+from algorithm.entities.robot.brain.worker_pool import WorkerPool, brain_map
+
+def evaluate_path(brain, path_index, obstacle_positions, curr):
+    """
+    Runs Brain.process_path for a path given as positions in brain.grid.obstacles, so it can be sent to a
+    worker process. Legs refer to their obstacle by that position, and the A* expansions made are returned
+    instead of being kept on the brain.
+    """
+    obstacles = brain.grid.obstacles
+    expansions = brain.expansions
+    order, path_index, total_dist, legs = brain.process_path(path_index, [obstacles[i] for i in obstacle_positions],
+                                                             curr)
+    legs = [(obstacles.index(obstacle), commands, target, end) for obstacle, commands, target, end in legs]
+    expansions, brain.expansions = brain.expansions - expansions, expansions
+    return order, path_index, total_dist, legs, expansions
+
+def rank_result(result):
+    """
+    Sort key of a process_path result: paths reaching more obstacles come first, then lower total distance.
+    A path that skips an obstacle has fewer legs to drive, so its distance alone would make it look better.
+    """
+    return -len(result[0]), result[2]
 
 class Brain:
     def __init__(self, robot, grid):
@@ -15,6 +44,17 @@ class Brain:
         self.grid = grid
         self.simple_hamiltonian = []  # Stores simplified Hamiltonian paths
         self.commands = deque()  # Command queue for the robot
+        self.search_buffers = SearchBuffers(grid.lattice.num_states)  # Per-state A* arrays reused by every search
+        self.expansions = 0  # A* node expansions made by the last plan_path call
+        self.cost_to_go = None  # CostToGoTables guiding A*, when enabled
+        self.search_epsilon = configs.PATH_SEARCH_EPSILON  # Weighted A* bound of the current plan, None for plain A*
+        self.leg_costs = None  # Leg-cost matrix of the last plan, when one was computed
+        self.order_strategy = configs.PATH_ORDER_STRATEGY  # How plan_path picks the obstacle order
+        self.pose_costs = None  # Pose leg-cost matrix of the last 'gtsp' plan
+        self.target_plan = {}  # Obstacle index -> (viewing pose, score of the rest, pose_costs index) candidates
+        self.leg_cache = {}  # (start pose, obstacle index) -> result of an unplanned search_leg in this plan
+        self.optimal = False  # Whether the last plan_path scored every obstacle order with A*
+        self.worker_pool = None  # WorkerPool of the plan in progress, when configs.NUM_THREADS is above 1
 
     def compute_simple_hamiltonian_path(self):
         """
@@ -34,6 +74,198 @@ class Brain:
         perms.sort(key=calc_distance)  # Sort by shortest path
         return perms
 
+    def compute_greedy_path(self):
+        """
+        Builds an obstacle order by always moving on to the obstacle with the nearest valid target.
+        """
+        remaining = list(self.grid.obstacles)
+        path = []
+        last_pos = self.robot.pos
+        while remaining:
+            def distance(obstacle):
+                target_pos = obstacle.get_nearest_valid_target(last_pos) if obstacle.valid_targets else obstacle.pos
+                return abs(last_pos.x - target_pos.x) + abs(last_pos.y - target_pos.y)
+
+            obstacle = min(remaining, key=distance)
+            remaining.remove(obstacle)
+            path.append(obstacle)
+            last_pos = obstacle.get_nearest_valid_target(last_pos) if obstacle.valid_targets else obstacle.pos
+        return path
+
+    def search_paths_anytime(self, paths, deadline):
+        """
+        Scores the candidate paths of the configured strategy, then 2-opt and or-opt moves around the best path
+        so far until none improves it or the deadline, a time.time() value, comes. Paths are scored in batches
+        of configs.NUM_THREADS, on the worker pool when there is one, and a batch is only started if the
+        slowest batch so far would still end before the deadline, except for the first. Returns the scored
+        paths and their process_path results.
+        """
+        batch_size = max(configs.NUM_THREADS, 1)
+        scored, orders = [], []
+        reserve = 0  # Longest single batch so far
+
+        def evaluate(batch):
+            nonlocal reserve
+            start = time.time()
+            results = self.process_paths(batch, len(scored))
+            reserve = max(reserve, time.time() - start)
+            scored.extend(batch)
+            orders.extend(results)
+            return results
+
+        def out_of_time():
+            return time.time() + reserve >= deadline
+
+        for start in range(0, len(paths), batch_size):
+            if scored and out_of_time():
+                break
+            evaluate(paths[start:start + batch_size])
+        best = min(orders, key=rank_result)
+        print(f"Candidate paths scored {best[2]} reaching {len(best[0])} obstacles")
+
+        improved = True
+        while improved:
+            improved = False
+            seen = {tuple(obstacle.index for obstacle in path) for path in scored}
+            moves = []
+            best_path = list(scored[best[1]])
+            for candidate in itertools.chain(two_opt_moves(best_path), or_opt_moves(best_path)):
+                key = tuple(obstacle.index for obstacle in candidate)
+                if key not in seen:
+                    seen.add(key)
+                    moves.append(candidate)
+            for start in range(0, len(moves), batch_size):
+                if out_of_time():
+                    return scored, orders
+                candidate = min(evaluate(moves[start:start + batch_size]), key=rank_result)
+                if rank_result(candidate) < rank_result(best):
+                    best, improved = candidate, True
+                    print(f"Local search improved the score to {best[2]} reaching {len(best[0])} obstacles")
+                    break
+
+        return scored, orders
+
+    def compute_leg_cost_paths(self):
+        """
+        Scores every obstacle order on the leg-cost matrix and returns them from cheapest to most expensive.
+        """
+        obstacles = self.grid.obstacles
+        self.leg_costs = compute_leg_costs(self, self.robot.pos.copy(), obstacles)
+        orders = sorted(itertools.permutations(range(1, len(obstacles) + 1)),
+                        key=lambda order: score_order(self.leg_costs, order))
+        return [[obstacles[i - 1] for i in order] for order in orders]
+
+    def confirm_candidates(self, order, count):
+        """
+        Turns a solver's order on the leg-cost matrix into the candidate paths A* scores: the order, its
+        closest runners-up on the matrix and the greedy nearest-target order, which keeps the plan from
+        doing worse than the Manhattan ranking when the matrix misjudges a leg.
+        """
+        obstacles = self.grid.obstacles
+        paths = [[obstacles[i - 1] for i in candidate] for candidate in candidate_orders(self.leg_costs, order, count)]
+        greedy = self.compute_greedy_path()
+        if greedy not in paths:
+            paths.append(greedy)
+        return paths
+
+    def compute_held_karp_paths(self, count):
+        """
+        Returns the provably cheapest obstacle order on the leg-cost matrix, found without enumerating
+        permutations, followed by the other candidates of confirm_candidates.
+        """
+        self.leg_costs = compute_leg_costs(self, self.robot.pos.copy(), self.grid.obstacles)
+        order, cost = held_karp(self.leg_costs)
+        print(f"Held-Karp order {order} with leg cost {cost}")
+        return self.confirm_candidates(order, count)
+
+    def compute_local_search_paths(self, count):
+        """
+        Returns a near-optimal obstacle order on the leg-cost matrix from iterated local search, for arenas
+        too large for held_karp, followed by the other candidates of confirm_candidates.
+        """
+        self.leg_costs = compute_leg_costs(self, self.robot.pos.copy(), self.grid.obstacles)
+        order, cost = local_search(self.leg_costs, configs.PATH_LOCAL_SEARCH_RESTARTS)
+        print(f"Local search order {order} with leg cost {cost}")
+        return self.confirm_candidates(order, count)
+
+    def compute_gtsp_path(self):
+        """
+        Picks the obstacle order and the viewing pose of every obstacle together, as a generalized TSP with
+        each obstacle's valid targets as one cluster. The pose leg-cost matrix is kept in pose_costs and the
+        candidate poses in target_plan, together with the cost of finishing the route from each, so
+        search_leg can settle the pose from the one the robot actually reached.
+        """
+        obstacles = self.grid.obstacles
+        start = self.robot.pos.copy()
+
+        def view_offset(obstacle, target):
+            # Among equally cheap targets, prefer those facing the image head-on, as they need no peek turn.
+            if obstacle.pos.direction in (Direction.TOP, Direction.BOTTOM):
+                return abs(target.x - obstacle.pos.x), abs(target.y - obstacle.pos.y)
+            return abs(target.y - obstacle.pos.y), abs(target.x - obstacle.pos.x)
+
+        # Matrix indices of the candidate poses of every obstacle that has any, capped to bound the solver.
+        # The poses kept are the cheapest to drive into from the start or from any other obstacle's targets.
+        poses, clusters, reachable = [], [], []
+        for obstacle in obstacles:
+            targets = obstacle.valid_targets
+            if not targets:
+                continue
+            sources = [start] + [target for other in obstacles if other is not obstacle
+                                 for target in other.valid_targets]
+            costs = search_leg_costs(self.grid, self, sources, [[target] for target in targets])
+            ranked = sorted(range(len(targets)), key=lambda i: (costs[i], view_offset(obstacle, targets[i])))
+            candidates = [targets[i] for i in ranked[:configs.PATH_GTSP_MAX_TARGETS]]
+            clusters.append(list(range(len(poses) + 1, len(poses) + len(candidates) + 1)))
+            reachable.append(obstacle)
+            poses.extend(candidates)
+
+        self.pose_costs = compute_pose_costs(self, start, poses)
+        order, _, cost = solve_gtsp(self.pose_costs, clusters, configs.PATH_GTSP_EXACT_LIMIT)
+        print(f"GTSP order {[reachable[c - 1].index for c in order]} with leg cost {cost}")
+
+        path = [reachable[c - 1] for c in order]
+        to_go = layered_costs_to_go(self.pose_costs, clusters, order)
+        self.target_plan = {reachable[c - 1].index: [(poses[p - 1], to_go[p], p) for p in clusters[c - 1]]
+                            for c in order}
+        # Obstacles without a valid target are still attempted last, as in the other strategies.
+        return path + [obstacle for obstacle in obstacles if obstacle not in reachable]
+
+    def search_leg(self, curr, obstacle, targets, at=None):
+        """
+        Runs A* from curr to the viewing pose planned for the obstacle, or to the given targets when there is
+        no plan or the planned pose cannot be reached. Returns the end pose, the target reached and the
+        commands of the leg, or None if no target can be reached.
+
+        ``at`` is the pose_costs index of the planned pose the robot is at, 0 for the start, or None when the
+        leg is not planned. The pose is then chosen from that matrix row plus the cost of finishing the route.
+        """
+        chosen = None
+        plan = self.target_plan.get(obstacle.index) if at is not None else None
+        if plan is not None:
+            chosen = min(plan, key=lambda candidate: self.pose_costs[at][candidate[2]] + candidate[1])[0]
+        else:
+            # Orders scored in one plan share their first legs, so unplanned legs are searched once per start pose.
+            key = (curr.x, curr.y, curr.direction, curr.angle, obstacle.index)
+            if key not in self.leg_cache:
+                self.leg_cache[key] = self.search_targets(curr, [targets])
+            return self.leg_cache[key]
+        return self.search_targets(curr, [[chosen], targets])
+
+    def search_targets(self, curr, target_lists):
+        """
+        Runs A* from curr to each list of targets in turn and returns the end pose, the target reached and the
+        commands of the first search that reaches one, or None if none does.
+        """
+        for ends in target_lists:
+            astar = ModifiedAStar(self.grid, self, curr, ends)
+            res = astar.start_astar(get_target=True)
+            self.expansions += astar.expansions
+            if res is not None:
+                position, chose_target = res
+                return position, ends[chose_target], astar.commands
+        return None
+
     def compress_paths(self):
         """
         Merges consecutive straight commands to minimize command count.
@@ -73,9 +305,126 @@ class Brain:
         return new_commands
     
 
-    def plan_path(self):
+    def compute_valid_targets(self):
+        """
+        Stores on every obstacle the target poses the robot can stand at and still see its image.
+        """
+        for obstacle in self.grid.obstacles:
+            possible_targets = obstacle.get_robot_target_pos()
+            reachable = [target for target in possible_targets if self.grid.check_valid_position(target)]
+            # Line of sight is checked for all reachable targets of this obstacle in one batch.
+            sights = self.grid.check_valid_sights([target.xy_coords() for target in reachable], obstacle)
+            valid_targets = [target for target, sight in zip(reachable, sights) if sight]
+            bad_sights = len(reachable) - len(valid_targets)
+            print(f"Obstacle {obstacle.index} has {len(valid_targets)} valid targets and {bad_sights} bad sights")
+            obstacle.valid_targets = valid_targets
+
+    def process_path(self, path_index, path, curr):
+        """
+        Drives A* through the obstacles of one candidate path from curr and scores the result.
+        Returns the indices of the obstacles reached, path_index, the total distance with turns weighted and
+        the (obstacle, commands, target, end pose) of every leg, which plan_path builds the final plan from.
+        """
+        order = []
+        legs = []
+        at = 0 if path_index == 0 and self.target_plan else None  # pose_costs index of the robot's planned pose
+        for obstacle in path:
+            leg = self.search_leg(curr, obstacle, obstacle.valid_targets, at)
+            if leg is None:
+                pass
+            else:
+                curr, target, commands = leg
+                legs.append((obstacle, commands, target, curr))
+                order.append(obstacle.index)
+                if at is not None:
+                    # The plan goes on from the pose reached, or stops if the leg fell back to other targets.
+                    at = next((index for pose, _, index in self.target_plan.get(obstacle.index, ())
+                               if pose is target), None)
+        string_commands = [command.convert_to_message() for _, commands, _, _ in legs for command in commands]
+        total_dist = 0
+        for command in string_commands:
+            parts = command.split(",")
+            if parts[0] == "1":  # move forward
+                total_dist += int(parts[2])
+            if parts[0] == "0":  # turn
+                total_dist += configs.PATH_TURN_SCORE
+        
+        return order, path_index, total_dist, legs
+
+    def worker_copy(self, grid):
+        """
+        Returns a copy of this brain for a worker process, planning on ``grid`` (a SharedGridView of this
+        brain's grid). It keeps the valid targets process_path reads, but not the robot, the pool, the leg cache
+        or the search buffers, which the worker builds up for itself. The cost-to-go predecessors and every
+        obstacle's table are built here first, so the workers share them instead of each building its own.
+        """
+        brain = copy.copy(self)
+        brain.robot = None
+        brain.grid = grid
+        brain.commands = deque()
+        brain.search_buffers = None
+        brain.worker_pool = None
+        brain.leg_cache = {}
+        if self.cost_to_go is not None:
+            lattice = self.grid.lattice
+            for obstacle in self.grid.obstacles:
+                self.cost_to_go.get([lattice.state_key(lattice.index(*target.xy_coords()), target.direction)
+                                     for target in obstacle.valid_targets])
+            brain.cost_to_go = copy.copy(self.cost_to_go)
+            brain.cost_to_go.grid = grid
+            brain.cost_to_go.tables = dict(self.cost_to_go.tables)
+        return brain
+
+    def close_worker_pool(self):
+        """
+        Shuts down the worker pool of the current plan, if one was started.
+        """
+        if self.worker_pool is not None:
+            self.worker_pool.close()
+            self.worker_pool = None
+
+    def process_paths(self, paths, first_index=0):
+        """
+        Runs process_path for every candidate path from the robot's position, on the worker pool when
+        configs.NUM_THREADS is above 1, and adds up the A* expansions of all of them. Paths are numbered from
+        first_index, so batches can be scored into one list.
+        """
+        obstacles = self.grid.obstacles
+        # The pool's brains were copied before the order was chosen, so they get the target plan with the work.
+        results = brain_map(self, evaluate_path, [(i, [obstacles.index(obstacle) for obstacle in path],
+                                                   self.robot.pos.copy()) for i, path in enumerate(paths, first_index)],
+                            {'target_plan': self.target_plan, 'pose_costs': self.pose_costs})
+        orders = []
+        for order, path_index, total_dist, legs, expansions in results:
+            self.expansions += expansions
+            legs = [(obstacles[i], commands, target, end) for i, commands, target, end in legs]
+            orders.append((order, path_index, total_dist, legs))
+        return orders
+
+    def plan_path(self, deadline=None, epsilon=None):
+        """
+        Plans the obstacle order and the commands to visit them.
+
+        Args:
+            deadline (float, optional): time.time() by which the plan should be done. When given, the
+                candidates of the configured order strategy are scored by search_paths_anytime, which then
+                improves on the best of them until local search converges or time runs out.
+            epsilon (float, optional): Weighted A* bound for the legs of this plan, overriding
+                configs.PATH_SEARCH_EPSILON. Larger values expand fewer nodes and may lengthen legs.
+
+        Returns:
+            tuple: The indices of the obstacles in visiting order and the target poses used.
+        """
         print("-" * 40)
         print("STARTING PATH COMPUTATION...")
+        self.expansions = 0
+        self.search_epsilon = epsilon if epsilon is not None else configs.PATH_SEARCH_EPSILON
+        self.leg_costs = None
+        self.pose_costs = None
+        self.target_plan = {}
+        self.leg_cache = {}
+        # Tables depend on the obstacles, so they are rebuilt for every plan.
+        self.cost_to_go = CostToGoTables(self.grid) if configs.PATH_COST_TO_GO_HEURISTIC else None
         if len(self.grid.obstacles) < 4:
             tot = 1
             for i in range(1, len(self.grid.obstacles) + 1):
@@ -86,124 +435,106 @@ class Brain:
         elif len(self.grid.obstacles) > 4:
             consider = configs.NUM_HAM_PATH_CHECK
 
-        valid_targets = []
-        for obstacle in self.grid.obstacles:
-            possible_targets = obstacle.get_robot_target_pos()
-            valid_targets = []
-            bad_sights = 0
-            for possible_target in possible_targets:
-                if self.grid.check_valid_position(possible_target):
-                    if self.grid.check_valid_sight(possible_target, obstacle):
-                        valid_targets.append(possible_target)
-                    else:
-                        bad_sights+=1
-            print(f"Obstacle {obstacle.index} has {len(valid_targets)} valid targets and {bad_sights} bad sights")
-            obstacle.valid_targets = valid_targets
+        self.compute_valid_targets()
         
-        paths = self.compute_simple_hamiltonian_path()[0:consider]
-        print(f"Considering", consider, "paths")
-        orders = []
+        # One pool runs every batch of this plan, from the leg-cost rows to scoring the paths.
+        self.worker_pool = WorkerPool(self) if configs.NUM_THREADS > 1 else None
+        try:
+            if self.order_strategy == 'gtsp':
+                # Only the first path drives to the planned poses. The same order is also scored with A* free to
+                # pick any valid target, since poses beyond the candidates kept can be cheaper once driven, and the
+                # greedy order is scored in case the plan misjudges a leg.
+                gtsp_path = self.compute_gtsp_path()
+                paths = [gtsp_path, gtsp_path]
+                greedy = self.compute_greedy_path()
+                if greedy not in paths:
+                    paths.append(greedy)
+                consider = len(paths)
+            elif self.order_strategy == 'local_search':
+                paths = self.compute_local_search_paths(configs.NUM_HAM_PATH_CHECK)
+                consider = len(paths)
+            elif self.order_strategy == 'held_karp':
+                paths = self.compute_held_karp_paths(configs.NUM_HAM_PATH_CHECK)
+                consider = len(paths)
+            elif self.order_strategy == 'leg_costs':
+                paths = self.compute_leg_cost_paths()[0:consider]
+                print("Leg costs", self.leg_costs)
+            else:
+                paths = self.compute_simple_hamiltonian_path()[0:consider]
+            print(f"Considering", consider, "paths")
 
-        def process_path(path_index, path, curr):   
-            commands = []
-            order = []
-            for obstacle in path:
-                valid_targets = obstacle.valid_targets
-                astar = ModifiedAStar(self.grid, self, curr, valid_targets)
-                res = astar.start_astar(get_target=False)
-                if res is None:
-                    pass
-                else:
-                    curr = res
-                    self.commands.append(ScanCommand(configs.ROBOT_SCANNING_TIME, obstacle.index))
-                    order.append(obstacle.index)
-            string_commands = [command.convert_to_message() for command in self.commands]
-            total_dist = 0
-            for command in string_commands:
-                parts = command.split(",")
-                if parts[0] == "1":  # move forward
-                    total_dist += int(parts[2])
-                if parts[0] == "0":  # turn
-                    total_dist += int(200)
-            
-            self.commands = []
-            
-            return order, path_index, total_dist              
-        
-        for i, path in enumerate(paths):
-            orders.append(process_path(i, path, self.robot.pos.copy()))
+            if deadline is None:
+                orders = self.process_paths(paths)
+            else:
+                paths, orders = self.search_paths_anytime(paths, deadline)
+            # The leg-cost matrix only ranks orders, so whatever the strategy, the best order is only certain to
+            # have been scored when every order was.
+            scored = {tuple(obstacle.index for obstacle in path) for path in paths}
+            self.optimal = len(scored) == math.factorial(len(self.grid.obstacles))
+        finally:
+            self.close_worker_pool()
+        print(f"A* expanded {self.expansions} nodes evaluating {len(paths)} paths (epsilon {self.search_epsilon})")
 
-        shortest = 10000
-        for item in orders:
-            if item[2] < shortest:
-                shortest = item[2]
-                best_index = item[1]
+        best_index = min(orders, key=rank_result)[1]
 
         self.simple_hamiltonian = paths[best_index]
         self.commands.clear()
         targets = []
 
-        curr = self.robot.pos.copy()  # We use a copy rather than get a reference.
-        for obstacle in self.simple_hamiltonian:
-            target = obstacle.get_robot_target_pos()
-            astar = ModifiedAStar(self.grid, self, curr, target)
-            p = astar.start_astar(get_target=True)
-            if p is None:
-                pass
+        # Every leg of the winning path was searched while scoring it, so the plan is assembled from those
+        # legs and only the peek turns around each scan are added.
+        for obstacle, commands, current_pos, _ in orders[best_index][3]:
+            self.commands.extend(commands)
+            targets.append(current_pos)
+
+            target_pos = obstacle.pos
+            peek_command = None
+            reversed_peek_command = None
+            turn_direction = None
+            if target_pos.direction == Direction.TOP or target_pos.direction == Direction.BOTTOM:
+                ratio = abs(current_pos.x - target_pos.x) / abs(current_pos.y - target_pos.y)
+            else:
+                ratio = abs(current_pos.y - target_pos.y) / abs(current_pos.x - target_pos.x)
+            theta = math.atan(ratio)
+            theta = math.degrees(theta)
+            if target_pos.direction == Direction.TOP:
+                if current_pos.x > target_pos.x + configs.PEEK_HORIZONTAL_THRESHOLD:
+                    turn_direction = "right"
+                elif current_pos.x < target_pos.x - configs.PEEK_HORIZONTAL_THRESHOLD:
+                    turn_direction = "left"
+            if target_pos.direction == Direction.BOTTOM:
+                if current_pos.x > target_pos.x + configs.PEEK_HORIZONTAL_THRESHOLD:
+                    turn_direction = "left"
+                elif current_pos.x < target_pos.x - configs.PEEK_HORIZONTAL_THRESHOLD:
+                    turn_direction = "right"
+            if target_pos.direction == Direction.LEFT:
+                if current_pos.y > target_pos.y + configs.PEEK_HORIZONTAL_THRESHOLD:
+                    turn_direction = "right"
+                elif current_pos.y < target_pos.y - configs.PEEK_HORIZONTAL_THRESHOLD:
+                    turn_direction = "left"
+            if target_pos.direction == Direction.RIGHT:
+                if current_pos.y > target_pos.y + configs.PEEK_HORIZONTAL_THRESHOLD:
+                    turn_direction = "left"
+                elif current_pos.y < target_pos.y - configs.PEEK_HORIZONTAL_THRESHOLD:
+                    turn_direction = "right"
+            if turn_direction == "right":
+                peek_command = TurnCommand(-theta, False)
+                reversed_peek_command = TurnCommand(theta, True)
             else:
-                res, chose_target = p                
-                targets.append(target[chose_target])
-                
-                curr = res
-                current_pos = target[chose_target]
-                target_pos = obstacle.pos
-                peek_command = None
-                reversed_peek_command = None
-                turn_direction = None
-                if target_pos.direction == Direction.TOP or target_pos.direction == Direction.BOTTOM:
-                    ratio = abs(current_pos.x - target_pos.x) / abs(current_pos.y - target_pos.y)
-                else:
-                    ratio = abs(current_pos.y - target_pos.y) / abs(current_pos.x - target_pos.x)
-                theta = math.atan(ratio)
-                theta = math.degrees(theta)
-                if target_pos.direction == Direction.TOP:
-                    if current_pos.x > target_pos.x + configs.PEEK_HORIZONTAL_THRESHOLD:
-                        turn_direction = "right"
-                    elif current_pos.x < target_pos.x - configs.PEEK_HORIZONTAL_THRESHOLD:
-                        turn_direction = "left"
-                if target_pos.direction == Direction.BOTTOM:
-                    if current_pos.x > target_pos.x + configs.PEEK_HORIZONTAL_THRESHOLD:
-                        turn_direction = "left"
-                    elif current_pos.x < target_pos.x - configs.PEEK_HORIZONTAL_THRESHOLD:
-                        turn_direction = "right"
-                if target_pos.direction == Direction.LEFT:
-                    if current_pos.y > target_pos.y + configs.PEEK_HORIZONTAL_THRESHOLD:
-                        turn_direction = "right"
-                    elif current_pos.y < target_pos.y - configs.PEEK_HORIZONTAL_THRESHOLD:
-                        turn_direction = "left"
-                if target_pos.direction == Direction.RIGHT:
-                    if current_pos.y > target_pos.y + configs.PEEK_HORIZONTAL_THRESHOLD:
-                        turn_direction = "left"
-                    elif current_pos.y < target_pos.y - configs.PEEK_HORIZONTAL_THRESHOLD:
-                        turn_direction = "right"
-                if turn_direction == "right":
-                    peek_command = TurnCommand(-theta, False)
-                    reversed_peek_command = TurnCommand(theta, True)
-                else:
-                    peek_command = TurnCommand(theta, False)
-                    reversed_peek_command = TurnCommand(-theta, True)
-                
-                if peek_command is not None and reversed_peek_command is not None:
-                    if abs(theta) > configs.PEEK_ANGLE_THRESHOLD:
-                        self.commands.append(peek_command)
-                        pass
-                
-                self.commands.append(ScanCommand(configs.ROBOT_SCANNING_TIME, obstacle.index))
-                
-                if peek_command is not None and reversed_peek_command is not None:
-                    if abs(theta) > configs.PEEK_ANGLE_THRESHOLD:
-                        self.commands.append(reversed_peek_command)
-                        pass
+                peek_command = TurnCommand(theta, False)
+                reversed_peek_command = TurnCommand(-theta, True)
+            
+            if peek_command is not None and reversed_peek_command is not None:
+                if abs(theta) > configs.PEEK_ANGLE_THRESHOLD:
+                    self.commands.append(peek_command)
+                    pass
+            
+            self.commands.append(ScanCommand(configs.ROBOT_SCANNING_TIME, obstacle.index))
+            
+            if peek_command is not None and reversed_peek_command is not None:
+                if abs(theta) > configs.PEEK_ANGLE_THRESHOLD:
+                    self.commands.append(reversed_peek_command)
+                    pass
         
         self.compress_paths()
         print("Number of Commands", len(self.commands))
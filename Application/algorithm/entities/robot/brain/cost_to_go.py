@@ -0,0 +1,91 @@
+import heapq
+import math
+
+from algorithm import configs
+from algorithm.entities.robot.brain.motion_primitives import get_library
+
+
+class CostToGoTables:
+    def __init__(self, grid):
+        """
+        Cost-to-go tables over the pose lattice, one per set of goal states.
+
+        A real pose can lie anywhere in its cell, so the moves are relaxed to cover every pose of a cell at
+        once: a move connects a state to every cell its end position can fall in from some point of the
+        cell, unless that cell holds no valid position at all. The swept area of turns is not checked. Each
+        table is a Dijkstra search over the reversed relaxed moves from a set of goal states, so every entry
+        is a lower bound on the cost of any real path, and an infinite entry means the goals cannot be
+        reached from that state at all.
+
+        Parameters:
+        grid (Grid): Grid whose occupancy the tables are computed against.
+        """
+        self.grid = grid
+        self.predecessors = None  # predecessors[state] lists (previous state, move cost) pairs.
+        self.tables = {}  # Cost-to-go arrays keyed by frozenset of goal states.
+
+    def build_predecessors(self):
+        """
+        Records every relaxed move against each state it can reach.
+        """
+        lattice = self.grid.lattice
+        size, length = lattice.size, configs.GRID_CELL_LENGTH
+        primitives = get_library()
+        predecessors = [[] for _ in range(lattice.num_states)]
+
+        # Cells holding at least one valid position; raster is indexed [x, y], cells run row major.
+        raster = self.grid.raster
+        has_valid = raster[:size * length, :size * length].reshape(size, length, size, length).any(axis=(1, 3))
+        has_valid = has_valid.T.flatten()
+
+        for state in range(lattice.num_states):
+            index, direction = lattice.split_state(state)
+            if not has_valid[index]:
+                continue
+            row, col = divmod(index, size)
+            for primitive in primitives.get(direction, direction.value):
+                # Cells overlapped by the cell shifted by the move, widened by one unit for rounding.
+                col_low = max(math.floor((col * length + primitive.end_x - 1) / length), 0)
+                col_high = min(math.floor(((col + 1) * length + primitive.end_x + 1) / length), size - 1)
+                row_low = max(math.floor((row * length + primitive.end_y - 1) / length), 0)
+                row_high = min(math.floor(((row + 1) * length + primitive.end_y + 1) / length), size - 1)
+                for next_row in range(row_low, row_high + 1):
+                    for next_col in range(col_low, col_high + 1):
+                        next_index = next_row * size + next_col
+                        if has_valid[next_index]:
+                            next_state = lattice.state_key(next_index, primitive.end_direction)
+                            predecessors[next_state].append((state, primitive.cost))
+
+        return predecessors
+
+    def get(self, goal_states):
+        """
+        Returns the cost-to-go array for a set of goal states, running the reverse search on first use.
+        States the goals cannot be reached from are left at infinity.
+        """
+        key = frozenset(state for state in goal_states if state >= 0)
+        table = self.tables.get(key)
+        if table is not None:
+            return table
+
+        if self.predecessors is None:
+            self.predecessors = self.build_predecessors()
+
+        table = [float('inf')] * self.grid.lattice.num_states
+        frontier = []
+        for state in key:
+            table[state] = 0
+            heapq.heappush(frontier, (0, state))
+
+        while frontier:
+            cost, state = heapq.heappop(frontier)
+            if cost > table[state]:
+                continue
+            for previous, weight in self.predecessors[state]:
+                new_cost = cost + weight
+                if new_cost < table[previous]:
+                    table[previous] = new_cost
+                    heapq.heappush(frontier, (new_cost, previous))
+
+        self.tables[key] = table
+        return table
@@ -0,0 +1,143 @@
+import heapq
+
+from algorithm import configs
+from algorithm.entities.robot.brain.mod_a_star import ModifiedAStar
+from algorithm.entities.robot.brain.worker_pool import brain_map
+
+UNREACHABLE_LEG_SCORE = 10 ** 6  # Score of a leg no search could complete; large but safe to add up
+
+
+def lattice_cost_to_score(cost):
+    """
+    Converts an A* path cost into the score Brain compares paths with: the straight distance in cm plus
+    PATH_TURN_SCORE for every turn.
+    """
+    turns = int(cost // configs.PATH_TURN_COST)
+    straights = round((cost - turns * configs.PATH_TURN_COST) / (configs.UNIT_STRAIGHT * configs.SCALING_FACTOR))
+    return straights * configs.UNIT_STRAIGHT + turns * configs.PATH_TURN_SCORE
+
+
+def score_row(i, costs):
+    """
+    Turns the lattice costs of the legs out of matrix row ``i`` into a matrix row of scores.
+    """
+    row = [0]
+    for j, leg_cost in enumerate(costs, start=1):
+        if i == j:
+            row.append(0)
+        elif leg_cost == float('inf'):
+            row.append(UNREACHABLE_LEG_SCORE)
+        else:
+            row.append(lattice_cost_to_score(leg_cost))
+    return row
+
+
+def search_leg_costs(grid, brain, sources, goal_sets):
+    """
+    Runs one multi-source Dijkstra search over the pose lattice and returns the lowest path cost from any
+    of the source poses to each set of goal poses, or infinity for sets that cannot be reached.
+
+    Parameters:
+    grid (Grid): Grid to search on.
+    brain (Brain): Brain whose search buffers are reused, may be None.
+    sources (list): RobotPositions the search starts from, all at cost 0.
+    goal_sets (list): Lists of RobotPositions, one per destination.
+    """
+    expander = ModifiedAStar(grid, brain, None, [])
+    buffers = expander.buffers
+    buffers.reset()
+    cost, position, closed, touched = buffers.cost, buffers.position, buffers.closed, buffers.touched
+
+    goals = {}  # Goal state -> indices of the goal sets containing it
+    for j, ends in enumerate(goal_sets):
+        for end in ends:
+            state = expander.get_state(end)
+            if state >= 0:
+                goals.setdefault(state, []).append(j)
+
+    costs = [float('inf')] * len(goal_sets)
+    remaining = len({j for indices in goals.values() for j in indices})
+
+    frontier = []
+    offset = 0  # Keeps pops in insertion order on equal costs
+    for source in sources:
+        state = expander.get_state(source)
+        if state >= 0 and cost[state] > 0:
+            offset += 1
+            heapq.heappush(frontier, (0, offset, state))
+            cost[state] = 0
+            position[state] = source
+            touched.append(state)
+
+    while frontier and remaining:
+        current_cost, _, current_state = heapq.heappop(frontier)
+        if closed[current_state]:
+            continue
+        closed[current_state] = True
+
+        for j in goals.get(current_state, ()):
+            if costs[j] == float('inf'):
+                costs[j] = current_cost
+                remaining -= 1
+
+        for next_state, next_position, weight, _ in expander.get_neighbours(position[current_state]):
+            if closed[next_state]:
+                continue
+            new_cost = current_cost + weight
+            if new_cost < cost[next_state]:
+                offset += 1
+                heapq.heappush(frontier, (new_cost, offset, next_state))
+                if cost[next_state] == float('inf'):
+                    touched.append(next_state)
+                cost[next_state] = new_cost
+                position[next_state] = next_position
+
+    return costs
+
+
+def leg_cost_row(brain, i, sources, goal_sets):
+    """
+    Scores row ``i`` of a leg-cost matrix with one search on the brain's grid.
+    """
+    return score_row(i, search_leg_costs(brain.grid, brain, sources, goal_sets))
+
+
+def compute_leg_costs(brain, start, obstacles):
+    """
+    Builds the leg-cost matrix of a layout with one search per row, the rows spread over the worker pool
+    when configs.NUM_THREADS allows.
+
+    Row 0 holds the legs from the robot's start pose and row ``i`` the legs from any valid target of
+    ``obstacles[i - 1]``; column ``j`` is the leg into the valid targets of ``obstacles[j - 1]``. Entries
+    are scores as returned by lattice_cost_to_score, with UNREACHABLE_LEG_SCORE for legs that cannot be
+    driven. Column 0 and the diagonal are 0.
+    """
+    goal_sets = [obstacle.valid_targets for obstacle in obstacles]
+    return brain_map(brain, leg_cost_row, [(i, sources, goal_sets)
+                                           for i, sources in enumerate([[start]] + goal_sets)])
+
+
+def score_order(matrix, order):
+    """
+    Returns the score of visiting the matrix rows in ``order`` (1-based obstacle positions) from the start.
+    """
+    score = 0
+    previous = 0
+    for current in order:
+        score += matrix[previous][current]
+        previous = current
+    return score
+
+
+def compute_pose_costs(brain, start, poses):
+    """
+    Builds the leg-cost matrix between individual poses with one search per row, the rows spread over the
+    worker pool when configs.NUM_THREADS allows.
+
+    Index 0 is the robot's start pose and index ``i`` is ``poses[i - 1]``. Entries are scores as returned
+    by lattice_cost_to_score, with UNREACHABLE_LEG_SCORE for legs that cannot be driven. Column 0 and the
+    diagonal are 0.
+    """
+    goal_sets = [[pose] for pose in poses]
+    return brain_map(brain, leg_cost_row, [(i, [source], goal_sets)
+                                           for i, source in enumerate([start] + poses)])
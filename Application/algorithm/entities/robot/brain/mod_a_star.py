@@ -1,109 +1,103 @@
-from queue import PriorityQueue
+import heapq
+
 from typing import List, Tuple
 
 from algorithm import configs
-from algorithm.entities.commands.command import Command
-from algorithm.entities.commands.straight_command import StraightCommand
-from algorithm.entities.commands.turn_command import TurnCommand
-from algorithm.entities.grid.node import Node
+from algorithm.entities.grid.lattice import HEADING_INDEX, HEADINGS
 from algorithm.entities.grid.position import RobotPosition
+from algorithm.entities.robot.brain.motion_primitives import MotionPrimitive, get_library
+
+class SearchBuffers:
+    def __init__(self, num_states):
+        """
+        Preallocated per-state arrays for A*, indexed by the integer lattice state.
+
+        Parameters:
+        num_states (int): Number of (cell, heading) states on the lattice.
+        """
+        self.cost = [float('inf')] * num_states  # Best known cost to reach each state
+        self.parent = [-1] * num_states  # State the best path came from, -1 for none
+        self.move = [None] * num_states  # MotionPrimitive taken from the parent state
+        self.position = [None] * num_states  # Continuous pose the best path reached the state with
+        self.closed = [False] * num_states  # Whether the state has already been expanded
+        self.touched = []  # States written during the current search
+
+    def reset(self):
+        """
+        Clears the states written by the previous search, so a reset costs no more than the search did.
+        """
+        cost, parent, move, position, closed = self.cost, self.parent, self.move, self.position, self.closed
+        for state in self.touched:
+            cost[state] = float('inf')
+            parent[state] = -1
+            move[state] = None
+            position[state] = None
+            closed[state] = False
+        self.touched.clear()
 
 class ModifiedAStar:
     def __init__(self, grid, brain, start: RobotPosition, possible_ends: List[RobotPosition]):
         # Create a copy of the grid to work with rather than modifying the original grid directly
         self.grid = grid
-        self.nodes = self.grid.nodes
+        self.lattice = self.grid.lattice  # Flat lattice of grid cells
         self.cache = self.grid.cache  # Cache to store already evaluated nodes
         self.brain = brain
+        self.primitives = get_library()  # Precomputed moves for every heading
+        # Reuse the brain's arrays across searches when it has them, otherwise allocate our own.
+        self.buffers = getattr(brain, 'search_buffers', None) or SearchBuffers(self.lattice.num_states)
+
+        self.expansions = 0  # Number of states expanded by the last search
+        self.commands = []  # Commands of the path found by the last search
 
         self.start = start
         self.possible_ends = possible_ends
         self.possible_xy = [end.xy_coords() for end in possible_ends]  # List of possible endpoint coordinates
 
-    def get_neighbours(self, pos: RobotPosition) -> List[Tuple[Node, RobotPosition, int, Command]]:
+    def get_neighbours(self, pos: RobotPosition) -> List[Tuple[int, RobotPosition, float, MotionPrimitive]]:
         """
         Retrieves valid neighboring positions for a given robot position on the grid.
-        Coordinates returned here are relative to the grid.
+        Each neighbour is identified by its integer lattice state (cell index * 4 + heading).
         """
         neighbours = []  # Store valid neighboring nodes
 
-        # Straight-line moves in both forward and reverse directions
-        straight_dist = configs.UNIT_STRAIGHT * configs.SCALING_FACTOR
-        straight_commands = [StraightCommand(straight_dist), StraightCommand(-straight_dist)]
-        
-        # Test all straight-line moves and add to neighbors if valid
-        for command in straight_commands:
-            next_node, next_position = self.check_valid_command(command, pos)
-            if next_node:
-                neighbours.append((next_node, next_position, straight_dist, command))
-
-        # Turn commands with penalties for different directional adjustments
-        turn_penalty = configs.PATH_TURN_COST
-        turn_commands = [
-            TurnCommand(90, False),   # 90-degree right turn (forward)
-            TurnCommand(-90, False),  # 90-degree left turn (forward)
-            TurnCommand(90, True),    # 90-degree right turn (reverse)
-            TurnCommand(-90, True)    # 90-degree left turn (reverse)
-        ]
-
-        # Test all turn commands and add to neighbors if valid
-        for command in turn_commands:
-            next_node, next_position = self.check_valid_command(command, pos)
-            if next_node:
-                neighbours.append((next_node, next_position, turn_penalty, command))
+        # Straight moves and turns come precomputed for the current heading, with their costs.
+        for primitive in self.primitives.get(pos.direction, pos.angle):
+            next_state, next_position = self.check_valid_primitive(primitive, pos)
+            if next_state is not None:
+                neighbours.append((next_state, next_position, primitive.cost, primitive))
 
         return neighbours
 
-    def check_valid_command(self, command: Command, pos: RobotPosition):
+    def check_valid_primitive(self, primitive: MotionPrimitive, pos: RobotPosition):
         """
-        Verifies if executing a command from the current position results in a valid grid position.
-        Returns None if the resulting position is invalid.
+        Verifies if executing a move from the current position results in a valid grid position.
+        Returns the lattice state and position reached, or (None, None) if the resulting position is invalid.
         """
-        # Check specifically for validity of turn command.
-        pos = pos.copy()
-        if isinstance(command, TurnCommand):
-            pos_copy = pos.copy()
-            original_direction = pos_copy.direction
-            for tick in range(command.ticks // configs.TURN_GRANULARITY):
-                tick_command = TurnCommand(command.angle / (command.ticks // configs.TURN_GRANULARITY),
-                                           command.rev)
-                tick_command.apply_on_pos(pos_copy, original_direction)
-                x = int(pos_copy.x)
-                y = int(pos_copy.y)
-                if self.cache.get((x, y)) is not None:
-                    v1 = self.cache[(x, y)]
-                else:
-                    v1 = False
-                col_num = x // configs.GRID_CELL_LENGTH
-                row_num = configs.GRID_NUM_GRIDS - (y // configs.GRID_CELL_LENGTH) - 1
-                if row_num < 0 or col_num < 0 or row_num >= len(self.nodes) or col_num >= len(self.nodes[0]):
-                    v2 = None
-                else:
-                    v2 = self.nodes[row_num][col_num]
-                if not (v1 and v2):
-                    return None, None
-        if isinstance(command, TurnCommand):
-            command.apply_on_pos(pos, pos.direction)
-        else:
-            command.apply_on_pos(pos)
-        x = int(pos.x)
-        y = int(pos.y)
-        if self.cache.get((x, y)) is not None:
-            v1 = self.cache[(x, y)]
-        else:
-            v1 = False
-        after = self.grid.get_coordinate_node(*pos.xy_coords())
-        if v1 and after:
-            after.pos.direction = pos.direction
-            return after.copy(), pos
-        # ! Check valid position is heavy
-        return None, None
+        raster = self.grid.raster
+        width, height = raster.shape
+
+        # Check every swept sample of a turn against the occupancy raster.
+        x, y = pos.x, pos.y
+        for step_x, step_y in primitive.steps:
+            x += step_x
+            y += step_y
+            sample_x, sample_y = int(x), int(y)
+            if not (0 <= sample_x < width and 0 <= sample_y < height and raster[sample_x, sample_y]):
+                return None, None
+
+        after_x = pos.x + primitive.end_x
+        after_y = pos.y + primitive.end_y
+        if not self.cache.get((int(after_x), int(after_y)), False):
+            return None, None
+        after = self.lattice.index(after_x, after_y)
+        if after == -1:
+            return None, None
+        return (self.lattice.state_key(after, primitive.end_direction),
+                RobotPosition(after_x, after_y, primitive.end_direction, primitive.end_angle))
     
     def is_within_bounds(self, x: int, y: int) -> bool:
         """Checks if coordinates are within the grid boundaries."""
-        col_num = x // configs.GRID_CELL_LENGTH
-        row_num = configs.GRID_NUM_GRIDS - (y // configs.GRID_CELL_LENGTH) - 1
-        return 0 <= row_num < len(self.nodes) and 0 <= col_num < len(self.nodes[0])
+        return self.lattice.index(x, y) != -1
 
     def heuristic(self, curr_pos: RobotPosition):
         """
@@ -114,53 +108,128 @@ class ModifiedAStar:
             min_dist = min(min_dist, abs(x - curr_pos.x) + abs(y - curr_pos.y))
         return min_dist
 
+    def turn_heuristic(self, curr_pos: RobotPosition, end_lanes, turn_reach):
+        """
+        Lower bound on the cost from the current position to the nearest endpoint state, counting the turns
+        still needed: one to face a perpendicular heading, two to face the opposite heading or to reach another
+        lane with the same heading, since straight moves never leave their lane. The turns can cover at most
+        turn_reach of the Manhattan distance each, and the rest has to be driven straight. A search ends on
+        reaching any pose in an endpoint's cell, so the distance is taken to the nearest point of that cell.
+
+        Parameters:
+        curr_pos (RobotPosition): Position to estimate from.
+        end_lanes (list): (heading index, row, column) of every endpoint.
+        turn_reach (float): Largest Manhattan distance a single turn moves the robot.
+        """
+        size, length = self.lattice.size, configs.GRID_CELL_LENGTH
+        row, col = divmod(self.lattice.index(curr_pos.x, curr_pos.y), size)
+        heading = HEADING_INDEX[curr_pos.direction]
+        min_cost = float('inf')
+        for end_heading, end_row, end_col in end_lanes:
+            heading_change = (end_heading - heading) % len(HEADINGS)
+            if heading_change == 0:
+                # Even heading indices move along a row, odd ones along a column.
+                same_lane = row == end_row if heading % 2 == 0 else col == end_col
+                turns = 0 if same_lane else 2
+            else:
+                turns = 2 if heading_change == 2 else 1
+            x_low, y_low = end_col * length, end_row * length
+            distance = (max(x_low - curr_pos.x, curr_pos.x - x_low - length, 0) +
+                        max(y_low - curr_pos.y, curr_pos.y - y_low - length, 0))
+            min_cost = min(min_cost, turns * configs.PATH_TURN_COST + max(distance - turns * turn_reach, 0))
+        return min_cost
+
+    def get_state(self, pos: RobotPosition) -> int:
+        """Returns the integer lattice state (cell index * 4 + heading) of a position."""
+        return self.lattice.state_key(self.lattice.index(*pos.xy_coords()), pos.direction)
+
     def start_astar(self, get_target=False):
         """Runs the A* algorithm to find the optimal path to the nearest endpoint."""
-        frontier = PriorityQueue()
-        backtrack = {}
-        cost = {}
-        
-        goal_nodes = [self.grid.get_coordinate_node(*end.xy_coords()).copy() for end in self.possible_ends]
-        for goal, end in zip(goal_nodes, self.possible_ends):
-            goal.pos.direction = end.direction
-
-        start_node = self.grid.get_coordinate_node(*self.start.xy_coords()).copy()
-        start_node.direction = self.start.direction
-
-        frontier.put((0, 0, (start_node, self.start)))
-        cost[start_node] = 0
-        backtrack[start_node] = (None, None)
-        offset = 0  # To avoid tie-breaking issues with PriorityQueue
-
-        while not frontier.empty():
-            priority, _, (current_node, current_position) = frontier.get()
-            
-            for i, goal_node in enumerate(goal_nodes):
-                if (current_node.x == goal_node.x and current_node.y == goal_node.y and
-                        current_node.direction == goal_node.pos.direction):
-                    self.extract_commands(backtrack, goal_node)
-                    return (current_position, i) if get_target else current_position
-
-            for next_node, next_position, weight, command in self.get_neighbours(current_position):
-                new_cost = cost[current_node] + weight
-
-                if next_node not in cost or new_cost < cost[next_node]:
+        frontier = []
+        buffers = self.buffers
+        buffers.reset()
+        cost, parent, move, position, closed, touched = (buffers.cost, buffers.parent, buffers.move,
+                                                         buffers.position, buffers.closed, buffers.touched)
+
+        goal_states = [self.get_state(end) for end in self.possible_ends]
+        # Goal state -> index of the first end pose in it, so the goal test is a single lookup per pop.
+        goal_index = {}
+        for i, goal_state in enumerate(goal_states):
+            goal_index.setdefault(goal_state, i)
+        start_state = self.get_state(self.start)
+        # Optional cost-to-go table for these goals, shared by the brain across legs.
+        tables = getattr(self.brain, 'cost_to_go', None)
+        cost_to_go = tables.get(goal_states) if tables is not None else None
+        # Optional weighted A*: estimates are inflated by epsilon and include the turns still needed. Closed
+        # states are reopened when a cheaper path to them turns up, which keeps legs within epsilon of optimal.
+        epsilon = getattr(self.brain, 'search_epsilon', None)
+        if epsilon is not None:
+            turn_reach = max(abs(primitive.end_x) + abs(primitive.end_y) for direction in HEADINGS
+                             for primitive in self.primitives.get(direction, direction.value)
+                             if primitive.distance is None)
+            end_lanes = [(HEADING_INDEX[end.direction], *divmod(self.lattice.index(end.x, end.y), self.lattice.size))
+                         for end in self.possible_ends]
+
+        heapq.heappush(frontier, (0, 0, start_state))
+        cost[start_state] = 0
+        position[start_state] = self.start
+        touched.append(start_state)
+        offset = 0  # To avoid tie-breaking issues on equal priorities
+        self.expansions = 0
+
+        while frontier:
+            priority, _, current_state = heapq.heappop(frontier)
+            # A state is pushed again whenever its cost improves; skip the outdated entries.
+            if closed[current_state]:
+                continue
+            closed[current_state] = True
+            current_position = position[current_state]
+
+            i = goal_index.get(current_state)
+            if i is not None:
+                self.commands = self.extract_commands(current_state)
+                return (current_position, i) if get_target else current_position
+
+            self.expansions += 1
+            for next_state, next_position, weight, primitive in self.get_neighbours(current_position):
+                if closed[next_state] and epsilon is None:
+                    continue
+                new_cost = cost[current_state] + weight
+
+                if new_cost < cost[next_state]:
+                    if cost_to_go is not None:
+                        estimate = cost_to_go[next_state]
+                        if estimate == float('inf'):
+                            continue  # The table is a lower bound, so no goal can be reached from here.
+                    elif epsilon is not None:
+                        estimate = self.turn_heuristic(next_position, end_lanes, turn_reach)
+                    else:
+                        estimate = self.heuristic(next_position)
+                    if epsilon is not None:
+                        estimate *= epsilon
                     offset += 1
-                    frontier.put((new_cost + self.heuristic(next_position), offset, (next_node, next_position)))
-                    backtrack[next_node] = (current_node, command)
-                    cost[next_node] = new_cost
+                    heapq.heappush(frontier, (new_cost + estimate, offset, next_state))
+                    closed[next_state] = False
+                    if cost[next_state] == float('inf'):
+                        touched.append(next_state)
+                    cost[next_state] = new_cost
+                    parent[next_state] = current_state
+                    move[next_state] = primitive
+                    position[next_state] = next_position
 
         return None
 
-    def extract_commands(self, backtrack, goal_node):
+    def extract_commands(self, goal_state):
         """
-        Retrieves the sequence of commands from the backtrack dictionary to reach the goal node.
+        Returns the sequence of commands from the parent array to reach the goal state.
         """
+        parent, move = self.buffers.parent, self.buffers.move
         commands = []
-        current = goal_node
-        while current:
-            current, command = backtrack.get(current, (None, None))
-            if command:
-                commands.append(command)
+        current = goal_state
+        while current != -1:
+            primitive = move[current]
+            if primitive is not None:
+                commands.append(primitive.make_command())
+            current = parent[current]
         commands.reverse()
-        self.brain.commands.extend(commands)
\ No newline at end of file
+        return commands
\ No newline at end of file
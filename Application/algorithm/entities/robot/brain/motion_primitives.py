@@ -0,0 +1,132 @@
+from algorithm import configs
+from algorithm.entities.commands.straight_command import StraightCommand
+from algorithm.entities.commands.turn_command import TurnCommand
+from algorithm.entities.grid.position import RobotPosition
+
+# Every config value that shapes a primitive; the library is rebuilt when any of them changes.
+PRIMITIVE_CONFIGS = (
+    'SCALING_FACTOR', 'FRAMES', 'UNIT_STRAIGHT', 'ROBOT_LENGTH', 'ROBOT_SPEED',
+    'ROBOT_LEFT_TURN_FACTOR', 'ROBOT_RIGHT_TURN_FACTOR', 'ROBOT_RIGHT_TURN_RADIUS_X',
+    'ROBOT_RIGHT_TURN_RADIUS_Y', 'PATH_TURN_COST', 'TURN_GRANULARITY',
+)
+
+# (angle, rev) of the turns offered to the search, in the order they are tried.
+TURNS = (
+    (90, False),   # 90-degree right turn (forward)
+    (-90, False),  # 90-degree left turn (forward)
+    (90, True),    # 90-degree right turn (reverse)
+    (-90, True),   # 90-degree left turn (reverse)
+)
+
+_library = None  # Shared PrimitiveLibrary
+_library_signature = None  # Config values the shared library was built with
+
+
+class MotionPrimitive:
+    __slots__ = ('distance', 'angle', 'rev', 'cost', 'steps', 'end_x', 'end_y', 'end_direction', 'end_angle')
+
+    def __init__(self, distance, angle, rev, cost, steps, end_x, end_y, end_direction, end_angle):
+        """
+        A single move of the search lattice, precomputed for one starting heading.
+
+        Parameters:
+        distance (float): Distance of a straight move, None for turns.
+        angle (float): Angle of a turn in degrees, None for straight moves.
+        rev (bool): Whether the turn is made in reverse.
+        cost (float): Path cost of the move.
+        steps (tuple): (dx, dy) increments between consecutive swept samples of a turn. Adding them one
+            by one to the start coordinates reproduces the sampled positions exactly.
+        end_x, end_y (float): Offset of the end position from the start position.
+        end_direction (Direction): Heading after the move.
+        end_angle (float): Robot angle after the move.
+        """
+        self.distance = distance
+        self.angle = angle
+        self.rev = rev
+        self.cost = cost
+        self.steps = steps
+        self.end_x = end_x
+        self.end_y = end_y
+        self.end_direction = end_direction
+        self.end_angle = end_angle
+
+    def __str__(self):
+        if self.distance is not None:
+            return f"MotionPrimitive(straight {self.distance})"
+        return f"MotionPrimitive(turn {self.angle}, rev={self.rev})"
+
+    __repr__ = __str__
+
+    def make_command(self):
+        """
+        Returns a fresh command object performing this move.
+        """
+        if self.distance is not None:
+            return StraightCommand(self.distance)
+        return TurnCommand(self.angle, self.rev)
+
+
+def build_primitives(direction, angle):
+    """
+    Computes the straight and turn primitives for a robot facing ``direction`` at ``angle``, by running the
+    same command geometry the search used to evaluate on every expansion from the origin.
+    """
+    primitives = []
+
+    # Straight-line moves in both forward and reverse directions
+    straight_dist = configs.UNIT_STRAIGHT * configs.SCALING_FACTOR
+    for distance in (straight_dist, -straight_dist):
+        end = RobotPosition(0, 0, direction, angle)
+        StraightCommand(distance).apply_on_pos(end)
+        primitives.append(MotionPrimitive(distance, None, False, straight_dist, (),
+                                          end.x, end.y, end.direction, end.angle))
+
+    # Turn commands, sampled at the same sub-turn granularity as the collision check
+    for turn_angle, rev in TURNS:
+        command = TurnCommand(turn_angle, rev)
+        sub_turns = command.ticks // configs.TURN_GRANULARITY
+        sub_angle = angle
+        steps = []
+        for _ in range(sub_turns):
+            # Applying each sub-turn at the origin yields its exact increment for the current angle.
+            increment = RobotPosition(0, 0, direction, sub_angle)
+            TurnCommand(command.angle / sub_turns, command.rev).apply_on_pos(increment, direction)
+            steps.append((increment.x, increment.y))
+            sub_angle = increment.angle
+
+        end = RobotPosition(0, 0, direction, angle)
+        command.apply_on_pos(end, direction)
+        primitives.append(MotionPrimitive(None, turn_angle, rev, configs.PATH_TURN_COST, tuple(steps),
+                                          end.x, end.y, end.direction, end.angle))
+
+    return tuple(primitives)
+
+
+class PrimitiveLibrary:
+    def __init__(self):
+        """
+        Lazily filled table of motion primitives keyed by (direction, angle) of the starting pose.
+        """
+        self.primitives = {}
+
+    def get(self, direction, angle):
+        """
+        Returns the primitives available from a heading, building them on first use.
+        """
+        primitives = self.primitives.get((direction, angle))
+        if primitives is None:
+            primitives = build_primitives(direction, angle)
+            self.primitives[(direction, angle)] = primitives
+        return primitives
+
+
+def get_library():
+    """
+    Returns the shared primitive library, replacing it if any config that shapes a primitive changed.
+    """
+    global _library, _library_signature
+    signature = tuple(getattr(configs, name) for name in PRIMITIVE_CONFIGS)
+    if _library is None or signature != _library_signature:
+        _library = PrimitiveLibrary()
+        _library_signature = signature
+    return _library
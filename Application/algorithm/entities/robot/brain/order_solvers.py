@@ -0,0 +1,332 @@
+import itertools
+import random
+
+
+def held_karp(matrix):
+    """
+    Finds the cheapest order to visit every obstacle of a leg-cost matrix, starting from row 0 and without
+    returning, by dynamic programming over subsets of visited obstacles.
+
+    Runs in O(2^n * n^2) time and keeps O(2^n * n) costs and parent pointers.
+
+    Parameters:
+    matrix (list): Square matrix as built by compute_leg_costs; entry [i][j] is the cost of the leg from
+        row i (0 = start, i = obstacle i) into obstacle j.
+
+    Returns:
+    tuple: (order, cost), where order lists 1-based obstacle positions.
+    """
+    n = len(matrix) - 1
+    if n == 0:
+        return [], 0
+
+    full = (1 << n) - 1
+    # cost[mask][j]: cheapest way to visit exactly the obstacles in mask, ending at obstacle j.
+    cost = [[float('inf')] * n for _ in range(1 << n)]
+    parent = [[-1] * n for _ in range(1 << n)]
+    for j in range(n):
+        cost[1 << j][j] = matrix[0][j + 1]
+
+    for mask in range(1, full):
+        mask_cost = cost[mask]
+        unvisited = [k for k in range(n) if not mask & (1 << k)]
+        for j in range(n):
+            current = mask_cost[j]
+            if current == float('inf'):
+                continue
+            legs = matrix[j + 1]
+            for k in unvisited:
+                next_mask = mask | (1 << k)
+                new_cost = current + legs[k + 1]
+                if new_cost < cost[next_mask][k]:
+                    cost[next_mask][k] = new_cost
+                    parent[next_mask][k] = j
+
+    last = min(range(n), key=lambda j: cost[full][j])
+    best = cost[full][last]
+
+    order = []
+    mask = full
+    while last != -1:
+        order.append(last + 1)
+        mask, last = mask & ~(1 << last), parent[mask][last]
+    order.reverse()
+    return order, best
+
+
+def layered_poses(matrix, clusters, order):
+    """
+    Picks one pose per cluster for a fixed visiting order, by a shortest-path search through the clusters
+    taken as consecutive layers.
+
+    Parameters:
+    matrix (list): Pose leg-cost matrix as built by compute_pose_costs; row 0 is the start pose.
+    clusters (list): For every obstacle, the matrix indices of its candidate poses.
+    order (list): 1-based cluster positions in visiting order.
+
+    Returns:
+    tuple: (poses, cost), where poses lists the chosen matrix index for each cluster of the order.
+    """
+    layer = {0: (0, [])}  # Pose -> (cost of the best route ending there, poses of that route)
+    for c in order:
+        next_layer = {}
+        for q in clusters[c - 1]:
+            best = None
+            for p, (cost, route) in layer.items():
+                if best is None or cost + matrix[p][q] < best[0]:
+                    best = (cost + matrix[p][q], route)
+            next_layer[q] = (best[0], best[1] + [q])
+        layer = next_layer
+
+    cost, poses = min(layer.values(), key=lambda item: item[0])
+    return poses, cost
+
+
+def layered_costs_to_go(matrix, clusters, order):
+    """
+    For a fixed visiting order, returns the cost of the cheapest route from every pose of the ordered
+    clusters through all of the clusters after its own.
+
+    Parameters:
+    matrix (list): Pose leg-cost matrix as built by compute_pose_costs.
+    clusters (list): For every obstacle, the matrix indices of its candidate poses.
+    order (list): 1-based cluster positions in visiting order.
+
+    Returns:
+    dict: Matrix index of each pose -> remaining cost after reaching it.
+    """
+    if not order:
+        return {}
+    to_go = {q: 0 for q in clusters[order[-1] - 1]}
+    for c, after in reversed(list(zip(order, order[1:]))):
+        for p in clusters[c - 1]:
+            to_go[p] = min(matrix[p][q] + to_go[q] for q in clusters[after - 1])
+    return to_go
+
+
+def solve_gtsp(matrix, clusters, exact_limit):
+    """
+    Chooses an obstacle order and one pose per obstacle that together minimise the total leg cost.
+
+    Up to ``exact_limit`` clusters the problem is solved exactly by a subset dynamic program over
+    (visited clusters, last pose). Beyond that the order comes from held_karp on the cheapest leg between
+    each pair of clusters, and layered_poses then picks the poses for that order.
+
+    Parameters:
+    matrix (list): Pose leg-cost matrix as built by compute_pose_costs; row 0 is the start pose.
+    clusters (list): For every obstacle, the non-empty list of matrix indices of its candidate poses.
+    exact_limit (int): Largest number of clusters solved exactly.
+
+    Returns:
+    tuple: (order, poses, cost), with order as 1-based cluster positions and poses as matrix indices.
+    """
+    n = len(clusters)
+    if n == 0:
+        return [], [], 0
+
+    if n > exact_limit:
+        cluster_matrix = [[0] + [min(matrix[0][q] for q in cluster) for cluster in clusters]]
+        for i, sources in enumerate(clusters, start=1):
+            cluster_matrix.append([0] + [0 if i == j else min(matrix[p][q] for p in sources for q in cluster)
+                                         for j, cluster in enumerate(clusters, start=1)])
+        order, _ = held_karp(cluster_matrix)
+        poses, cost = layered_poses(matrix, clusters, order)
+        return order, poses, cost
+
+    owner = {p: c for c, cluster in enumerate(clusters) for p in cluster}
+    full = (1 << n) - 1
+    # cost[mask][p]: cheapest way to visit exactly the clusters in mask, ending at pose p.
+    cost = [{} for _ in range(1 << n)]
+    parent = [{} for _ in range(1 << n)]
+    for c, cluster in enumerate(clusters):
+        for p in cluster:
+            cost[1 << c][p] = matrix[0][p]
+            parent[1 << c][p] = 0
+
+    for mask in range(1, full):
+        unvisited = [c for c in range(n) if not mask & (1 << c)]
+        for p, current in cost[mask].items():
+            legs = matrix[p]
+            for c in unvisited:
+                next_mask = mask | (1 << c)
+                next_cost, next_parent = cost[next_mask], parent[next_mask]
+                for q in clusters[c]:
+                    new_cost = current + legs[q]
+                    if new_cost < next_cost.get(q, float('inf')):
+                        next_cost[q] = new_cost
+                        next_parent[q] = p
+
+    last = min(cost[full], key=cost[full].get)
+    best = cost[full][last]
+
+    order, poses = [], []
+    mask = full
+    while last != 0:
+        order.append(owner[last] + 1)
+        poses.append(last)
+        mask, last = mask & ~(1 << owner[last]), parent[mask][last]
+    order.reverse()
+    poses.reverse()
+    return order, poses, best
+
+
+def two_opt_moves(order):
+    """
+    Yields every order obtained by reversing one contiguous stretch of at least two stops. The route does
+    not return to the start, so reversing a stretch that ends the route is a valid move too.
+    """
+    n = len(order)
+    for i in range(n - 1):
+        for j in range(i + 2, n + 1):
+            yield order[:i] + order[i:j][::-1] + order[j:]
+
+
+def or_opt_moves(order, max_segment=3):
+    """
+    Yields every order obtained by moving a run of up to ``max_segment`` consecutive stops to another place
+    in the route, keeping the run's direction.
+    """
+    n = len(order)
+    for length in range(1, min(max_segment, n - 1) + 1):
+        for i in range(n - length + 1):
+            segment = order[i:i + length]
+            rest = order[:i] + order[i + length:]
+            for j in range(len(rest) + 1):
+                if j != i:
+                    yield rest[:j] + segment + rest[j:]
+
+
+def candidate_orders(matrix, order, count):
+    """
+    Returns ``order`` followed by the cheapest distinct orders one 2-opt or or-opt move away from it, ranked
+    on the leg-cost matrix, ``count`` orders in all. The matrix only ranks orders, so a solver's answer is
+    handed to A* together with its closest runners-up.
+    """
+    def cost(candidate):
+        return sum(matrix[a][b] for a, b in zip([0] + candidate, candidate))
+
+    seen = {tuple(order)}
+    neighbours = []
+    for candidate in itertools.chain(two_opt_moves(order), or_opt_moves(order)):
+        if tuple(candidate) not in seen:
+            seen.add(tuple(candidate))
+            neighbours.append(candidate)
+    neighbours.sort(key=cost)
+    return [list(order)] + neighbours[:count - 1]
+
+
+def nearest_neighbour(matrix):
+    """
+    Builds an order on a leg-cost matrix by always taking the cheapest leg to an unvisited obstacle.
+    """
+    remaining = set(range(1, len(matrix)))
+    order = []
+    current = 0
+    while remaining:
+        current = min(remaining, key=lambda j: (matrix[current][j], j))
+        remaining.remove(current)
+        order.append(current)
+    return order
+
+
+def improve_order(matrix, order, max_segment=3):
+    """
+    Applies improving 2-opt and or-opt moves to an order until none is left, and returns the local optimum
+    with its cost. Every move is costed in constant time from prefix sums of the route, so a full sweep
+    over the neighbourhood takes O(n^2) for any matrix, symmetric or not.
+    """
+    route = [0] + list(order)
+    n = len(route) - 1
+
+    improved = True
+    while improved:
+        improved = False
+        # forward[k] / backward[k]: cost of route[0..k] driven forwards / of its legs driven in reverse.
+        forward, backward = [0] * (n + 1), [0] * (n + 1)
+        for k in range(n):
+            forward[k + 1] = forward[k] + matrix[route[k]][route[k + 1]]
+            backward[k + 1] = backward[k] + matrix[route[k + 1]][route[k]]
+
+        # 2-opt: reverse route[i..j].
+        for i in range(1, n):
+            for j in range(i + 1, n + 1):
+                old = matrix[route[i - 1]][route[i]] + forward[j] - forward[i]
+                new = matrix[route[i - 1]][route[j]] + backward[j] - backward[i]
+                if j < n:
+                    old += matrix[route[j]][route[j + 1]]
+                    new += matrix[route[i]][route[j + 1]]
+                if new < old:
+                    route[i:j + 1] = route[i:j + 1][::-1]
+                    improved = True
+                    break
+            if improved:
+                break
+        if improved:
+            continue
+
+        # or-opt: move route[i..i + length - 1] to sit after route[k].
+        for length in range(1, min(max_segment, n - 1) + 1):
+            for i in range(1, n - length + 2):
+                end = i + length - 1
+                first, last, before = route[i], route[end], route[i - 1]
+                after = route[end + 1] if end < n else None
+                removal = matrix[before][first]
+                if after is not None:
+                    removal += matrix[last][after] - matrix[before][after]
+                for k in range(n + 1):
+                    if i - 1 <= k <= end:
+                        continue
+                    insertion = matrix[route[k]][first]
+                    if k < n:
+                        insertion += matrix[last][route[k + 1]] - matrix[route[k]][route[k + 1]]
+                    if insertion < removal:
+                        segment = route[i:end + 1]
+                        rest = route[:i] + route[end + 1:]
+                        at = k + 1 if k < i else k + 1 - length
+                        route = rest[:at] + segment + rest[at:]
+                        improved = True
+                        break
+                if improved:
+                    break
+            if improved:
+                break
+
+    cost = sum(matrix[route[k]][route[k + 1]] for k in range(n))
+    return route[1:], cost
+
+
+def perturb_order(order, rng):
+    """
+    Returns a double-bridge perturbation of an order (A B C D -> A C B D), a kick that local moves cannot
+    easily undo, or a shuffled copy when the order is too short to cut into four parts.
+    """
+    n = len(order)
+    if n < 8:
+        kicked = list(order)
+        rng.shuffle(kicked)
+        return kicked
+    a, b, c = sorted(rng.sample(range(1, n), 3))
+    return order[:a] + order[b:c] + order[a:b] + order[c:]
+
+
+def local_search(matrix, restarts, seed=0):
+    """
+    Iterated local search for the visiting order on a leg-cost matrix: the nearest-neighbour order is
+    improved to a local optimum, then ``restarts`` times the best order so far is perturbed and improved
+    again. Runtime grows with restarts * n^2 per sweep rather than with the number of orders.
+
+    Parameters:
+    matrix (list): Square leg-cost matrix as built by compute_leg_costs.
+    restarts (int): Number of perturbation rounds after the first descent.
+    seed (int): Seed of the perturbations, so a layout always gets the same plan.
+
+    Returns:
+    tuple: (order, cost), where order lists 1-based obstacle positions.
+    """
+    rng = random.Random(seed)
+    best_order, best = improve_order(matrix, nearest_neighbour(matrix))
+    for _ in range(restarts):
+        order, cost = improve_order(matrix, perturb_order(best_order, rng))
+        if cost < best:
+            best_order, best = order, cost
+    return best_order, best
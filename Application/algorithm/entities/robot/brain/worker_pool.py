@@ -0,0 +1,94 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import util
+
+from algorithm import configs
+from algorithm.entities.grid.shared_grid import SharedGrid
+from algorithm.entities.robot.brain.mod_a_star import SearchBuffers
+
+_worker_brain = None  # Brain copy owned by a pool worker process
+
+
+def init_worker(brain):
+    """
+    Stores the worker's own copy of the brain, as made by Brain.worker_copy, and gives it the SearchBuffers
+    it searches with. Its grid is a read-only view of the shared memory block.
+    """
+    global _worker_brain
+    brain.search_buffers = SearchBuffers(brain.grid.lattice.num_states)
+    _worker_brain = brain
+    # Pool workers leave through multiprocessing's exit path, which runs its finalizers but not atexit.
+    util.Finalize(None, close_worker, exitpriority=0)
+
+
+def close_worker():
+    """
+    Detaches the worker's brain from the shared memory block when the worker exits, undoing init_worker.
+    """
+    global _worker_brain
+    if _worker_brain is not None:
+        _worker_brain.grid.close()
+        _worker_brain = None
+
+
+def call_with_worker_brain(function, args, state):
+    """
+    Sets the given attributes on the worker's brain, then runs function(brain, *args) against it.
+    """
+    if state:
+        _worker_brain.__dict__.update(state)
+    return function(_worker_brain, *args)
+
+
+class WorkerPool:
+    def __init__(self, brain):
+        """
+        Process pool that runs the batches of one plan. The grid is exported into shared memory and the
+        workers are given their copy of the brain, as it is now, only once, so later batches of the same plan
+        reuse both. Call close() when the plan is done; each worker detaches from the block as it exits and
+        the block is freed once they all have.
+
+        Parameters:
+        brain (Brain): Brain whose grid and valid targets the workers plan with.
+        """
+        self.shared = SharedGrid(brain.grid)
+        self.executor = ProcessPoolExecutor(max_workers=configs.NUM_THREADS, initializer=init_worker,
+                                            initargs=(brain.worker_copy(self.shared.view),))
+
+    def map(self, function, args_list, state=None):
+        """
+        Runs function(brain, *args) in the workers for every args tuple, after setting the attributes in
+        state on their brain. Returns the results in the order of args_list.
+        """
+        count = len(args_list)
+        return list(self.executor.map(call_with_worker_brain, [function] * count, args_list, [state] * count))
+
+    def close(self):
+        """
+        Waits for the workers to exit and frees the shared grid.
+        """
+        self.executor.shutdown()
+        self.shared.close()
+
+
+def brain_map(brain, function, args_list, state=None):
+    """
+    Calls function(brain, *args) for every args tuple and returns the results in the order of args_list.
+
+    While plan_path holds a WorkerPool on brain.worker_pool the calls are spread over it, each worker
+    searching on a view of the shared grid with its own copy of the brain. function must therefore be a
+    module level function whose effects on the brain are returned rather than stored, and brain attributes
+    changed since the pool started must be passed in state.
+
+    Parameters:
+    brain (Brain): Brain the calls run against, may be None to always run in this process.
+    function (function): Module level function taking the brain followed by one args tuple.
+    args_list (list): Argument tuples, one per call.
+    state (dict, optional): Brain attributes the workers need updated, already current on brain itself.
+
+    Returns:
+    list: Result of every call.
+    """
+    pool = getattr(brain, 'worker_pool', None)
+    if pool is None or len(args_list) <= 1:
+        return [function(brain, *args) for args in args_list]
+    return pool.map(function, args_list, state)
@@ -0,0 +1,103 @@
+import argparse
+import contextlib
+import io
+import random
+import time
+from algorithm import configs
+from algorithm.app import AlgoPathPlanner
+from algorithm.entities.robot.brain.leg_costs import compute_leg_costs
+from algorithm.entities.robot.brain.order_solvers import held_karp, local_search
+from test_main import obstacle_optimizer, parse_obstacle_data
+
+EXACT_LIMIT = 12  # Largest instance held_karp is run on for comparison
+ARENA_LIMIT = 20  # Most obstacles random_layout can always fit; random placement jams at 21 to 31
+PLACEMENT_ATTEMPTS = 10000  # Random positions random_layout tries before giving up
+
+def random_layout(num_obstacles, rng):
+    """
+    Generate an arena layout in the /algo format with obstacles at least 30 cm apart. Raises ValueError
+    if the obstacles cannot be placed within PLACEMENT_ATTEMPTS tries.
+    """
+    layout = {}
+    used = []
+    for _ in range(PLACEMENT_ATTEMPTS):
+        if len(layout) == num_obstacles:
+            break
+        x, y = rng.randrange(2, 19) * 10, rng.randrange(2, 19) * 10
+        if any(abs(x - ux) < 30 and abs(y - uy) < 30 for ux, uy in used):
+            continue
+        used.append((x, y))
+        layout[str(len(layout))] = [x, y, rng.choice([0, 90, -90, 180]), len(layout) + 1]
+    if len(layout) < num_obstacles:
+        raise ValueError(f"Could only place {len(layout)} of {num_obstacles} obstacles 30 cm apart")
+    return layout
+
+def arena_matrix(num_obstacles, rng):
+    """
+    Build the leg-cost matrix of a random arena layout with the real planner.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):  # Silence the planner's logging
+        obstacles = parse_obstacle_data(obstacle_optimizer(random_layout(num_obstacles, rng)))
+        app = AlgoPathPlanner(obstacles)
+        brain = app.robot.brain
+        brain.compute_valid_targets()
+        return compute_leg_costs(brain, app.robot.pos.copy(), app.grid.obstacles)
+
+def synthetic_matrix(num_obstacles, rng):
+    """
+    Build a leg-cost matrix for an arena larger than the real one: Manhattan distances between random
+    viewing points plus zero to two turns per leg, so legs are not symmetric.
+    """
+    points = [(0, 0)] + [(rng.randrange(0, 1000, 10), rng.randrange(0, 1000, 10)) for _ in range(num_obstacles)]
+    matrix = []
+    for i, (x1, y1) in enumerate(points):
+        row = [0]
+        for j, (x2, y2) in enumerate(points[1:], start=1):
+            turns = rng.randint(0, 2)
+            row.append(0 if i == j else abs(x1 - x2) + abs(y1 - y2) + turns * configs.PATH_TURN_SCORE)
+        matrix.append(row)
+    return matrix
+
+def benchmark(sizes, trials, make_matrix, rng):
+    """
+    Solve every instance with local search, and with held_karp when it is small enough, and print the
+    runtime and the optimality gap for each size.
+    """
+    print(f"{'n':>3} {'local s':>9} {'exact s':>9} {'mean gap':>9} {'max gap':>9} {'optimal':>8}")
+    for size in sizes:
+        local_time = exact_time = 0
+        gaps = []
+        for _ in range(trials):
+            matrix = make_matrix(size, rng)
+            st = time.time()
+            _, cost = local_search(matrix, configs.PATH_LOCAL_SEARCH_RESTARTS)
+            local_time += time.time() - st
+            if size <= EXACT_LIMIT:
+                st = time.time()
+                _, best = held_karp(matrix)
+                exact_time += time.time() - st
+                gaps.append((cost - best) / best if best else 0)
+        if gaps:
+            optimal = sum(1 for gap in gaps if gap == 0)
+            print(f"{size:>3} {local_time / trials:>9.3f} {exact_time / trials:>9.3f} "
+                  f"{sum(gaps) / len(gaps):>9.2%} {max(gaps):>9.2%} {optimal:>4}/{trials:<3}")
+        else:
+            print(f"{size:>3} {local_time / trials:>9.3f} {'-':>9} {'-':>9} {'-':>9} {'-':>8}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare the local-search order solver with exact solutions.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 8, 10, 12, 15, 20, 30],
+                        help="obstacle counts to benchmark")
+    parser.add_argument("--trials", type=int, default=10, help="instances per size")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random instances")
+    parser.add_argument("--arena", action="store_true",
+                        help="use leg costs of random layouts in the real arena instead of synthetic matrices")
+    args = parser.parse_args()
+
+    sizes = args.sizes
+    if args.arena:
+        sizes = [size for size in args.sizes if size <= ARENA_LIMIT]
+        if len(sizes) < len(args.sizes):
+            print(f"Skipping arena sizes above {ARENA_LIMIT}, which do not always fit 30 cm apart")
+    rng = random.Random(args.seed)
+    benchmark(sizes, args.trials, arena_matrix if args.arena else synthetic_matrix, rng)
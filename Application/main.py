@@ -3,18 +3,21 @@ import sys
 sys.path.append('/home/pi/Documents/MDP_Project/Application')
 import time
 import json
+import copy
+import hashlib
+from collections import OrderedDict
 from flask import Flask,request, jsonify
 from flask_cors import CORS
 from image_rec import predict_image, load_model, stitch_image, stitch_image_own
 
 import sys
+import threading
 import time
 from typing import List
 from algorithm import configs
 from algorithm.app import AlgoPathPlanner
 from algorithm.entities.assets.direction import Direction
 from algorithm.entities.grid.obstacle import Obstacle
-from algorithm.entities.grid.grid import Grid
 from matplotlib import pyplot as plt
 
 
@@ -26,6 +29,56 @@ CORS(app)
 
 
 model = load_model()
+
+# Grid kept across /algo requests so resent layouts only re-stamp the obstacles that changed.
+algo_grid = None
+algo_grid_lock = threading.Lock()
+
+
+class PlanCache:
+    """
+    In-process LRU cache of finished /algo responses, keyed by the obstacle layout and planner configs.
+    """
+    def __init__(self, max_size, max_age=None):
+        self.max_size = max_size  # Number of layouts kept, 0 disables caching
+        self.max_age = max_age  # Seconds before an entry expires, None for no expiry
+        self.entries = OrderedDict()  # key -> (time stored, response), least recently used first
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(obstacle_data: dict, deadline=None, epsilon=None) -> str:
+        # Every upper-case configs value can change the plan, so all of them are part of the key.
+        # So can the planning deadline, which bounds how many orders get scored, and the search epsilon.
+        planner_configs = {name: getattr(configs, name) for name in dir(configs) if name.isupper()}
+        canonical = json.dumps({"obstacles": obstacle_data, "configs": planner_configs, "deadline": deadline,
+                                "epsilon": epsilon},
+                               sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            stored_at, response = entry
+            if self.max_age is not None and time.time() - stored_at > self.max_age:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return copy.deepcopy(response)
+
+    def put(self, key, response):
+        if self.max_size <= 0:
+            return
+        with self.lock:
+            self.entries[key] = (time.time(), copy.deepcopy(response))
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)  # Evict the least recently used layout
+
+
+plan_cache = PlanCache(configs.PLAN_CACHE_SIZE, configs.PLAN_CACHE_MAX_AGE)
+
 # DATA_FILE = os.path.join(os.getcwd(), 'obstacles_data.json')
 # DATA_FILE ='Application/obstacles_data.json'
 
@@ -132,11 +185,24 @@ def stitch():
     img = stitch_image()
     img.show()
     return jsonify({"result": "ok"})
+def is_finite_at_least(value, low):
+    """
+    Whether a value from a JSON request is a finite number of at least low. Booleans are not numbers here.
+    """
+    return not isinstance(value, bool) and isinstance(value, (int, float)) and low <= value < float('inf')
+
 @app.route('/algo', methods=['POST'])
 def algo():
     data = request.json['obstacles']
+    deadline = request.json.get('deadline')  # Seconds the planner may take, None to run to completion
+    epsilon = request.json.get('epsilon')  # Weighted A* bound, None for the configured search
+    # Anything else would fail inside planning, or make the budget or bound meaningless.
+    if deadline is not None and not is_finite_at_least(deadline, 0):
+        return jsonify({'error': 'deadline must be a finite number of seconds, at least 0'}), 400
+    if epsilon is not None and not is_finite_at_least(epsilon, 1):
+        return jsonify({'error': 'epsilon must be a number of at least 1'}), 400
     print("Data Received by algo\n" + str(data))
-    order_and_commands = run_algo(data)
+    order_and_commands = run_algo(data, deadline, epsilon)
     print("Order and commands: " + str(order_and_commands))
     return jsonify(order_and_commands)
 
@@ -249,17 +315,28 @@ def command_optimizer(commands: list) -> list:
     print("New Commands:" + str(commands))
     return commands
 
-def run_algo(obstacle_data):
+def run_algo(obstacle_data, deadline=None, epsilon=None):
+    global algo_grid
     st = time.time() # start to receive the obstacle
+    plan_deadline = st + float(deadline) if deadline is not None else None
+    plan_epsilon = float(epsilon) if epsilon is not None else None
     
     # Obstacle Optimizer
     obstacle_data = obstacle_optimizer(obstacle_data)
+
+    # Layouts that were already planned (reconnect resends, retries) are answered from the cache
+    cache_key = plan_cache.make_key(obstacle_data, deadline, epsilon)
+    cached = plan_cache.get(cache_key)
+    if cached is not None:
+        print("Plan cache hit, time taken", time.time() - st)
+        return cached
     
     obstacles = parse_obstacle_data(obstacle_data)
-    app = AlgoPathPlanner(obstacles)
-    grid = Grid(obstacles)
-    # draw_validity_grid(grid)
-    order = app.execute() # [] all are based 1, but might in different order, for e.g: [8,4,3,1] and missing some as well
+    with algo_grid_lock:  # The shared grid is updated and planned on by one request at a time
+        app = AlgoPathPlanner(obstacles, grid=algo_grid)
+        algo_grid = app.grid
+        # draw_validity_grid(app.grid)
+        order = app.execute(plan_deadline, plan_epsilon) # [] all are based 1, but might in different order, for e.g: [8,4,3,1] and missing some as well
     # obstacles_ordered = []
     # for index in order:
     #     for obstacle in obstacles:
@@ -278,8 +355,10 @@ def run_algo(obstacle_data):
     order_and_commands = {
         "order": order,
         "commands": commands,
-        "path_hist": None
+        "path_hist": None,
+        "optimal": app.optimal  # Whether the best visiting order was certainly among those scored
     }
+    plan_cache.put(cache_key, order_and_commands)
     return order_and_commands
 
 
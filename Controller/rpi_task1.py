@@ -372,7 +372,14 @@ class RPI:
         self.logger.info(f"data: {data}")
 
         url = f"http://{API_IP}:{API_PORT}/algo"
-        response = requests.post(url, json=data)
+        try:
+            # The server returns its best plan by the deadline, so the wait is bounded too.
+            response = requests.post(url, json={**data, "deadline": ALGO_DEADLINE}, timeout=ALGO_TIMEOUT)
+        except requests.Timeout:
+            self.android_q.put(android_msg(
+                "error", "Algo API timed out."))
+            self.logger.error("Algo API timed out.")
+            return
 
         if response.status_code != 200:
             self.android_q.put(android_msg(
@@ -386,6 +393,7 @@ class RPI:
         commands = result.get('commands', [])
         order = result.get('order', [])
         print(order)
+        self.logger.info(f"Algo plan optimal: {result.get('optimal', False)}")
         
         id_index = 0
 
@@ -4,3 +4,7 @@ BAUD_RATE = 115200
 # Image Recognition API
 API_IP = '192.168.4.16'
 API_PORT = 5001
+
+# Algo API
+ALGO_DEADLINE = 20  # Seconds the algo server may spend planning a path
+ALGO_TIMEOUT = ALGO_DEADLINE + 10  # Seconds to wait for the algo server's reply before giving up